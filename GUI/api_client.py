@@ -1,139 +1,447 @@
-import requests
-
-BASE_URL = "http://127.0.0.1:8000"
-
-
-# ---------- Playback state & basic controls ----------
-
-def get_playback_state():
-    resp = requests.get(f"{BASE_URL}/playback/state", timeout=5)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def play():
-    resp = requests.post(f"{BASE_URL}/playback/play", timeout=5)
-    resp.raise_for_status()
-
-
-def pause():
-    resp = requests.post(f"{BASE_URL}/playback/pause", timeout=5)
-    resp.raise_for_status()
-
-
-def next_track():
-    resp = requests.post(f"{BASE_URL}/playback/next", timeout=5)
-    resp.raise_for_status()
-
-
-def previous_track():
-    resp = requests.post(f"{BASE_URL}/playback/previous", timeout=5)
-    resp.raise_for_status()
-
-
-def seek(position_ms: int):
-    resp = requests.post(
-        f"{BASE_URL}/playback/seek",
-        json={"position_ms": int(position_ms)},
-        timeout=5,
-    )
-    resp.raise_for_status()
-
-
-# ---------- Volume / shuffle / repeat ----------
-
-def set_volume(volume_percent: int):
-    resp = requests.post(
-        f"{BASE_URL}/playback/volume",
-        json={"volume_percent": int(volume_percent)},
-        timeout=5,
-    )
-    resp.raise_for_status()
-
-
-def set_shuffle(state: bool):
-    resp = requests.post(
-        f"{BASE_URL}/playback/shuffle",
-        json={"state": bool(state)},
-        timeout=5,
-    )
-    resp.raise_for_status()
-
-
-def set_repeat(mode: str):
-    resp = requests.post(
-        f"{BASE_URL}/playback/repeat",
-        json={"mode": mode},
-        timeout=5,
-    )
-    resp.raise_for_status()
-
-
-# ---------- Devices ----------
-
-def get_devices():
-    resp = requests.get(f"{BASE_URL}/devices", timeout=5)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def transfer_playback(device_id: str):
-    resp = requests.post(
-        f"{BASE_URL}/devices/transfer",
-        json={"device_id": device_id},
-        timeout=5,
-    )
-    resp.raise_for_status()
-
-
-# ---------- Playlists ----------
-
-def get_playlists():
-    resp = requests.get(f"{BASE_URL}/playlists", timeout=10)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def get_playlist_tracks(playlist_id: str):
-    resp = requests.get(
-        f"{BASE_URL}/playlists/{playlist_id}/tracks",
-        timeout=10,
-    )
-    resp.raise_for_status()
-    return resp.json()
-
-
-def play_playlist(playlist_id: str, device_id: str = None):
-    payload = {"playlist_id": playlist_id, "device_id": device_id}
-    resp = requests.post(f"{BASE_URL}/playlists/play", json=payload, timeout=10)
-    resp.raise_for_status()
-
-
-def add_track_to_playlist(playlist_id: str, track_uri: str):
-    resp = requests.post(
-        f"{BASE_URL}/playlists/{playlist_id}/add_track",
-        json={"track_uri": track_uri},
-        timeout=10,
-    )
-    resp.raise_for_status()
-
-
-def remove_track_from_playlist(playlist_id: str, track_uri: str):
-    resp = requests.post(
-        f"{BASE_URL}/playlists/{playlist_id}/remove_track",
-        json={"track_uri": track_uri},
-        timeout=10,
-    )
-    resp.raise_for_status()
-
-# ---------- Queue ----------
-
-def get_queue():
-    resp = requests.get(f"{BASE_URL}/queue", timeout=5)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def clear_queue():
-    resp = requests.post(f"{BASE_URL}/queue/clear", timeout=5)
-    resp.raise_for_status()
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, Dict, Tuple
+from urllib.parse import quote
+
+import socket
+
+import ijson
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+_LOG = logging.getLogger(__name__)
+
+# Disable Nagle on pooled sockets so sub-100-byte control POSTs (seek,
+# volume) go out immediately, and enable TCP keep-alive probes so idle
+# pool connections aren't silently reaped by the OS.
+_SOCKET_OPTIONS = list(HTTPConnection.default_socket_options) + [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+class _LowLatencyAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = _SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+# Optional Unix-domain-socket transport: when SPOTIFY_CTL_UDS points at
+# the socket the backend was started with (uvicorn --uds <path>), calls
+# skip the loopback TCP stack entirely. This is opt-in for scripted use
+# of this module only — the Qt GUI polls the backend over TCP, so the
+# default stays http://127.0.0.1:8000.
+_UDS_PATH = os.getenv("SPOTIFY_CTL_UDS")
+
+if _UDS_PATH:
+    import requests_unixsocket  # optional dependency, see README
+
+    BASE_URL = "http+unix://" + quote(_UDS_PATH, safe="")
+    _SESSION = requests_unixsocket.Session()
+    # Match the TCP path's pool sizing and transient-5xx retries. The
+    # TCP_NODELAY/SO_KEEPALIVE options in _LowLatencyAdapter don't apply
+    # to AF_UNIX sockets, so those stay TCP-only.
+    _SESSION.mount(
+        "http+unix://",
+        requests_unixsocket.UnixAdapter(
+            pool_connections=20,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.05,
+                status_forcelist=[502, 503, 504],
+            ),
+        ),
+    )
+else:
+    BASE_URL = "http://127.0.0.1:8000"
+
+    # One shared Session so every call reuses the pooled keep-alive
+    # connection to the local backend instead of opening a new socket.
+    # The pool is sized for bursty UI refreshes (devices + playlists +
+    # queue fired together) and retries briefly on transient 5xx.
+    _SESSION = requests.Session()
+    _SESSION.mount(
+        "http://",
+        _LowLatencyAdapter(
+            # Sized for the worst burst: dashboard refresh + debounced
+            # seek/volume + background executor posts all in flight at once
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.05,
+                status_forcelist=[502, 503, 504],
+            ),
+        ),
+    )
+
+_SESSION.headers.update(
+    {
+        "Connection": "keep-alive",
+        "Accept": "application/json",
+        # Explicitly negotiate compression: playlist/track listings are
+        # list-of-dict JSON that compresses 5-10x over the wire.
+        "Accept-Encoding": "br, gzip",
+    }
+)
+atexit.register(_SESSION.close)
+
+
+def _warm_pool():
+    try:
+        _SESSION.head(BASE_URL + "/", timeout=2)
+    except Exception:
+        # Backend may not be up yet; the first real call then just pays
+        # the handshake it would have paid anyway.
+        pass
+
+
+# Prime the keep-alive pool off the critical path so the user's first
+# click reuses an already-open socket.
+threading.Thread(target=_warm_pool, name="api-warmup", daemon=True).start()
+
+# Precomputed URLs so hot paths don't rebuild strings on every call.
+# Parametric endpoints keep a %s placeholder filled per call.
+_URL_SEEK = BASE_URL + "/playback/seek"
+_URL_VOLUME = BASE_URL + "/playback/volume"
+_URL_TRANSFER = BASE_URL + "/devices/transfer"
+_URL_PLAYLISTS_PLAY = BASE_URL + "/playlists/play"
+_URL_STREAM = BASE_URL + "/playback/stream"
+_URL_BATCH = BASE_URL + "/batch"
+_URL_PLAYLIST_TRACKS = "/playlists/%s/tracks"
+_URL_PLAYLIST_ADD_TRACKS = BASE_URL + "/playlists/%s/add_tracks"
+_URL_PLAYLIST_REMOVE_TRACKS = BASE_URL + "/playlists/%s/remove_tracks"
+
+# ETag cache for slow-changing list endpoints: path -> (etag, parsed json).
+# On a 304 we reuse the cached body and skip the download + decode.
+_etag_cache: Dict[str, Tuple[str, Any]] = {}
+
+# orjson handles both directions: decoding large playlist payloads and
+# encoding the small POST bodies, both faster than the stdlib parser.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Shuffle/repeat only ever send a handful of fixed payloads, so the
+# encoded bodies are built once at import.
+_SHUFFLE_BODIES = {state: orjson.dumps({"state": state}) for state in (True, False)}
+_REPEAT_BODIES = {mode: orjson.dumps({"mode": mode}) for mode in ("off", "track", "context")}
+
+
+def _json(resp):
+    return orjson.loads(resp.content)
+
+
+# Prepared-request templates for hot fixed endpoints (state poll, basic
+# controls): URL parsing and header-dict construction happen once at
+# import instead of on every call.
+def _prepare(method: str, path: str):
+    return _SESSION.prepare_request(requests.Request(method, BASE_URL + path))
+
+
+_PREP_GETS = {
+    path: _prepare("GET", path)
+    for path in ("/playback/state", "/devices", "/queue")
+}
+_PREP_POSTS = {
+    path: _prepare("POST", path)
+    for path in (
+        "/playback/play",
+        "/playback/pause",
+        "/playback/next",
+        "/playback/previous",
+        "/queue/clear",
+    )
+}
+
+
+def _get_prepared(path: str, timeout: int = 5):
+    resp = _SESSION.send(_PREP_GETS[path], timeout=timeout)
+    resp.raise_for_status()
+    return _json(resp)
+
+
+def _cached_get(path: str, timeout: int = 10):
+    cached = _etag_cache.get(path)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    resp = _SESSION.get(BASE_URL + path, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached:
+        return cached[1]
+    resp.raise_for_status()
+    data = _json(resp)
+    etag = resp.headers.get("ETag")
+    if etag:
+        _etag_cache[path] = (etag, data)
+    return data
+
+
+def invalidate(path_prefix: str):
+    """Drop cached entries after a mutation (add/remove track)."""
+    for key in list(_etag_cache):
+        if key.startswith(path_prefix):
+            del _etag_cache[key]
+
+
+class _Debouncer:
+    """
+    Coalesces rapid calls by key: a new schedule() within the delay window
+    cancels the pending one, so only the latest value is actually sent.
+    Used for slider-drag endpoints (seek, volume) that fire many times
+    per second but only the final position matters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers: Dict[str, threading.Timer] = {}
+
+    def schedule(self, key: str, delay_ms: int, action):
+        with self._lock:
+            pending = self._timers.get(key)
+            if pending is not None:
+                pending.cancel()
+            timer = threading.Timer(delay_ms / 1000.0, self._fire, args=(key, action))
+            timer.daemon = True
+            self._timers[key] = timer
+            timer.start()
+
+    def _fire(self, key, action):
+        with self._lock:
+            self._timers.pop(key, None)
+        try:
+            action()
+        except Exception:
+            _LOG.warning("debounced %s call failed", key, exc_info=True)
+
+
+_debouncer = _Debouncer()
+
+# Worker pool for fire-and-forget control calls (play/pause/next/...):
+# the UI does not need the HTTP response, so the GUI thread only pays
+# the cost of enqueueing. The workers reuse the pooled Session.
+_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="api")
+
+
+def _post(path: str, body: bytes = None, timeout: int = 5):
+    try:
+        prep = _PREP_POSTS.get(path) if body is None else None
+        if prep is not None:
+            resp = _SESSION.send(prep, timeout=timeout)
+        else:
+            resp = _SESSION.post(
+                BASE_URL + path,
+                data=body,
+                headers=_JSON_HEADERS if body is not None else None,
+                timeout=timeout,
+            )
+        resp.raise_for_status()
+    except Exception:
+        _LOG.warning("POST %s failed", path, exc_info=True)
+
+
+# ---------- Playback state & basic controls ----------
+
+def get_playback_state():
+    return _get_prepared("/playback/state")
+
+
+def stream_playback_state(callback):
+    """
+    Consume the /playback/stream SSE feed, invoking callback with each
+    decoded state dict. Blocks until the connection drops, so run it on
+    a background thread; get_playback_state() stays available as a
+    one-shot fallback.
+    """
+    with _SESSION.get(
+        _URL_STREAM,
+        stream=True,
+        timeout=None,
+        # Opt this one request out of compression: GZipMiddleware never
+        # flushes the compressor between chunks, so gzipped SSE events
+        # sit in its buffer instead of reaching us.
+        headers={"Accept-Encoding": "identity"},
+    ) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            if line.startswith(b"data:"):
+                callback(orjson.loads(line[5:]))
+
+
+def play():
+    _EXEC.submit(_post, "/playback/play")
+
+
+def pause():
+    _EXEC.submit(_post, "/playback/pause")
+
+
+def next_track():
+    _EXEC.submit(_post, "/playback/next")
+
+
+def previous_track():
+    _EXEC.submit(_post, "/playback/previous")
+
+
+def seek(position_ms: int):
+    """Debounced: rapid slider drags collapse into one POST."""
+
+    def _send():
+        resp = _SESSION.post(
+            _URL_SEEK,
+            data=orjson.dumps({"position_ms": position_ms}),
+            headers=_JSON_HEADERS,
+            timeout=5,
+        )
+        resp.raise_for_status()
+
+    _debouncer.schedule("seek", 75, _send)
+
+
+# ---------- Volume / shuffle / repeat ----------
+
+def set_volume(volume_percent: int):
+    """Debounced: rapid slider drags collapse into one POST."""
+
+    def _send():
+        resp = _SESSION.post(
+            _URL_VOLUME,
+            data=orjson.dumps({"volume_percent": volume_percent}),
+            headers=_JSON_HEADERS,
+            timeout=5,
+        )
+        resp.raise_for_status()
+
+    _debouncer.schedule("volume", 100, _send)
+
+
+def set_shuffle(state: bool):
+    body = _SHUFFLE_BODIES.get(state) or orjson.dumps({"state": state})
+    _EXEC.submit(_post, "/playback/shuffle", body)
+
+
+def set_repeat(mode: str):
+    body = _REPEAT_BODIES.get(mode) or orjson.dumps({"mode": mode})
+    _EXEC.submit(_post, "/playback/repeat", body)
+
+
+# ---------- Devices ----------
+
+def get_devices():
+    return _get_prepared("/devices")
+
+
+def transfer_playback(device_id: str):
+    resp = _SESSION.post(
+        _URL_TRANSFER,
+        data=orjson.dumps({"device_id": device_id}),
+        headers=_JSON_HEADERS,
+        timeout=5,
+    )
+    resp.raise_for_status()
+
+
+# ---------- Playlists ----------
+
+def get_playlists():
+    return _cached_get("/playlists", timeout=10)
+
+
+def get_playlist_tracks(playlist_id: str):
+    return _cached_get(_URL_PLAYLIST_TRACKS % playlist_id, timeout=10)
+
+
+def iter_playlist_tracks(playlist_id: str):
+    """
+    Stream-parse playlist tracks with ijson, yielding each track as it
+    arrives instead of materializing the whole response. Useful for very
+    large playlists where time-to-first-track and peak memory matter;
+    get_playlist_tracks keeps the cached whole-list behaviour.
+    """
+    with _SESSION.get(
+        BASE_URL + _URL_PLAYLIST_TRACKS % playlist_id,
+        stream=True,
+        timeout=30,
+    ) as resp:
+        resp.raise_for_status()
+        # resp.raw is undecoded by default; with the session negotiating
+        # gzip, ijson would otherwise be fed compressed bytes.
+        resp.raw.decode_content = True
+        yield from ijson.items(resp.raw, "tracks.item")
+
+
+def play_playlist(playlist_id: str, device_id: str = None):
+    payload = {"playlist_id": playlist_id, "device_id": device_id}
+    resp = _SESSION.post(
+        _URL_PLAYLISTS_PLAY,
+        data=orjson.dumps(payload),
+        headers=_JSON_HEADERS,
+        timeout=10,
+    )
+    resp.raise_for_status()
+
+
+def add_tracks_to_playlist(playlist_id: str, track_uris):
+    """Add many tracks in one round-trip instead of one POST per URI."""
+    resp = _SESSION.post(
+        _URL_PLAYLIST_ADD_TRACKS % playlist_id,
+        data=orjson.dumps({"uris": list(track_uris)}),
+        headers=_JSON_HEADERS,
+        timeout=15,
+    )
+    resp.raise_for_status()
+    invalidate("/playlists/%s" % playlist_id)
+
+
+def remove_tracks_from_playlist(playlist_id: str, track_uris):
+    """Remove many tracks in one round-trip instead of one POST per URI."""
+    resp = _SESSION.post(
+        _URL_PLAYLIST_REMOVE_TRACKS % playlist_id,
+        data=orjson.dumps({"uris": list(track_uris)}),
+        headers=_JSON_HEADERS,
+        timeout=15,
+    )
+    resp.raise_for_status()
+    invalidate("/playlists/%s" % playlist_id)
+
+
+def add_track_to_playlist(playlist_id: str, track_uri: str):
+    add_tracks_to_playlist(playlist_id, [track_uri])
+
+
+def remove_track_from_playlist(playlist_id: str, track_uri: str):
+    remove_tracks_from_playlist(playlist_id, [track_uri])
+
+# ---------- Queue ----------
+
+def get_queue():
+    return _get_prepared("/queue")
+
+
+def clear_queue():
+    _EXEC.submit(_post, "/queue/clear")
+
+
+# ---------- Batch ----------
+
+def get_dashboard():
+    """
+    Fetch playback state + devices + queue + playlists in one round-trip.
+    Returns a dict keyed by "state", "devices", "queue", "playlists".
+    """
+    calls = [
+        {"id": "state", "method": "GET", "path": "/playback/state"},
+        {"id": "devices", "method": "GET", "path": "/devices"},
+        {"id": "queue", "method": "GET", "path": "/queue"},
+        {"id": "playlists", "method": "GET", "path": "/playlists"},
+    ]
+    resp = _SESSION.post(
+        _URL_BATCH,
+        data=orjson.dumps({"calls": calls}),
+        headers=_JSON_HEADERS,
+        timeout=10,
+    )
+    resp.raise_for_status()
+    return _json(resp)
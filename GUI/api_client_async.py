@@ -0,0 +1,161 @@
+"""
+Async mirror of api_client for callers running an asyncio event loop.
+
+Uses a single httpx.AsyncClient with HTTP/2 so independent requests
+(devices + playlists + queue) multiplex on one connection instead of
+paying one round-trip each. The sync api_client stays the default for
+the Qt widgets; this module exists so async code can await the same
+endpoints without blocking.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+from api_client import BASE_URL
+
+# HTTP/2 lets independent GETs (playlist fetch while a state poll is in
+# flight) share one multiplexed connection instead of opening a second
+# socket, so the connection cap can stay tiny.
+_client = httpx.AsyncClient(
+    base_url=BASE_URL,
+    http2=True,
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=2, max_connections=4),
+)
+
+
+async def aclose():
+    await _client.aclose()
+
+
+# ---------- Playback state & basic controls ----------
+
+async def get_playback_state():
+    resp = await _client.get("/playback/state")
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def play():
+    resp = await _client.post("/playback/play")
+    resp.raise_for_status()
+
+
+async def pause():
+    resp = await _client.post("/playback/pause")
+    resp.raise_for_status()
+
+
+async def next_track():
+    resp = await _client.post("/playback/next")
+    resp.raise_for_status()
+
+
+async def previous_track():
+    resp = await _client.post("/playback/previous")
+    resp.raise_for_status()
+
+
+async def seek(position_ms: int):
+    resp = await _client.post("/playback/seek", json={"position_ms": position_ms})
+    resp.raise_for_status()
+
+
+# ---------- Volume / shuffle / repeat ----------
+
+async def set_volume(volume_percent: int):
+    resp = await _client.post(
+        "/playback/volume",
+        json={"volume_percent": volume_percent},
+    )
+    resp.raise_for_status()
+
+
+async def set_shuffle(state: bool):
+    resp = await _client.post("/playback/shuffle", json={"state": state})
+    resp.raise_for_status()
+
+
+async def set_repeat(mode: str):
+    resp = await _client.post("/playback/repeat", json={"mode": mode})
+    resp.raise_for_status()
+
+
+# ---------- Devices ----------
+
+async def get_devices():
+    resp = await _client.get("/devices")
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def transfer_playback(device_id: str):
+    resp = await _client.post("/devices/transfer", json={"device_id": device_id})
+    resp.raise_for_status()
+
+
+# ---------- Playlists ----------
+
+async def get_playlists():
+    resp = await _client.get("/playlists", timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def get_playlist_tracks(playlist_id: str):
+    resp = await _client.get(f"/playlists/{playlist_id}/tracks", timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def play_playlist(playlist_id: str, device_id: Optional[str] = None):
+    payload = {"playlist_id": playlist_id, "device_id": device_id}
+    resp = await _client.post("/playlists/play", json=payload, timeout=10)
+    resp.raise_for_status()
+
+
+async def add_track_to_playlist(playlist_id: str, track_uri: str):
+    resp = await _client.post(
+        f"/playlists/{playlist_id}/add_track",
+        json={"track_uri": track_uri},
+        timeout=10,
+    )
+    resp.raise_for_status()
+
+
+async def remove_track_from_playlist(playlist_id: str, track_uri: str):
+    resp = await _client.post(
+        f"/playlists/{playlist_id}/remove_track",
+        json={"track_uri": track_uri},
+        timeout=10,
+    )
+    resp.raise_for_status()
+
+
+# ---------- Queue ----------
+
+async def get_queue():
+    resp = await _client.get("/queue")
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def clear_queue():
+    resp = await _client.post("/queue/clear")
+    resp.raise_for_status()
+
+
+# ---------- Convenience ----------
+
+async def load_dashboard():
+    """
+    Fetch devices + playlists + queue concurrently on one connection.
+    """
+    devices, playlists, queue = await asyncio.gather(
+        get_devices(),
+        get_playlists(),
+        get_queue(),
+    )
+    return {"devices": devices, "playlists": playlists, "queue": queue}
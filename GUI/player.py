@@ -1,18 +1,31 @@
 import sys
 import subprocess
+import functools
 import math
-import random
 import json
 import inspect
+import re
+import time
+
+import numpy as np
+import orjson
 from PySide6.QtGui import QPainterPath, QLinearGradient
 from PySide6.QtCore import QUrl
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PySide6.QtNetwork import (
+    QNetworkAccessManager,
+    QNetworkDiskCache,
+    QNetworkRequest,
+    QNetworkReply,
+)
 from typing import Optional
 from pathlib import Path
 
 
 from PySide6.QtGui import (
+    QImage,
+    QImageReader,
     QPixmap,
+    QPixmapCache,
     QPainter,
     QPen,
     QBrush,
@@ -35,11 +48,112 @@ from PySide6.QtWidgets import (
     QFrame,
     QProgressBar,
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import (
+    Qt,
+    QTimer,
+    QBuffer,
+    QByteArray,
+    QEvent,
+    QObject,
+    QRunnable,
+    QSize,
+    QStandardPaths,
+    QThreadPool,
+    Signal,
+)
 
 import webbrowser
 import api_client
 
+# The reel spokes sit at fixed 45° steps, so their (cos, sin) pairs never
+# change — compute them once instead of on every reel rebuild.
+_SPOKE_TRIG = [
+    (math.cos(math.radians(angle)), math.sin(math.radians(angle)))
+    for angle in range(0, 360, 45)
+]
+
+
+def _hsv_lut(s: int, v: int, alpha: int = 255) -> list:
+    """360-entry hue lookup table for one fixed (saturation, value) pair."""
+    colors = []
+    for h in range(360):
+        c = QColor.fromHsv(h, s, v)
+        c.setAlpha(alpha)
+        colors.append(c)
+    return colors
+
+
+# The animated gradients only ever vary hue; precompute the HSV->RGB
+# conversion for every degree so the 20-30 Hz paint paths index a list
+# instead of calling QColor.fromHsv three times per frame.
+_CASSETTE_LUT_1 = _hsv_lut(180, 50)
+_CASSETTE_LUT_2 = _hsv_lut(200, 55)
+_CASSETTE_LUT_3 = _hsv_lut(180, 45)
+_CASSETTE_GLOW_LUT = _hsv_lut(255, 255, alpha=45)
+_BG_LUT_1 = _hsv_lut(200, 50)
+_BG_LUT_2 = _hsv_lut(220, 55)
+_BG_LUT_3 = _hsv_lut(200, 45)
+_ACCENT_LUT = _hsv_lut(255, 255)
+
+
+# Crude genre detection for theming: one precompiled alternation plus a
+# token -> theme map instead of four substring scans per refresh.
+_GENRE_RE = re.compile(
+    r"\b(rock|metal|punk|edm|dance|club|remix|chill|lofi|sleep|study|jazz|swing|bossa)\b"
+)
+_GENRE_MAP = {
+    "rock": "rock", "metal": "rock", "punk": "rock",
+    "edm": "edm", "dance": "edm", "club": "edm", "remix": "edm",
+    "chill": "chill", "lofi": "chill", "sleep": "chill", "study": "chill",
+    "jazz": "jazz", "swing": "jazz", "bossa": "jazz",
+}
+
+
+# Accent QSS factory, memoized by hex: QApplication.setStyleSheet forces
+# an app-wide repolish, so the string build must never be the reason we
+# call it — and identical hexes must not call it at all.
+@functools.lru_cache(maxsize=512)
+def _accent_qss(accent_hex: str) -> str:
+    return f"""
+    QPushButton {{
+        background: rgba(30,30,30,180);
+        border: 1px solid {accent_hex};
+        border-radius: 8px;
+        padding: 6px 10px;
+        color: #eee;
+    }}
+    QPushButton:hover {{
+        background: rgba(50,50,50,210);
+    }}
+    QProgressBar#songProgress::chunk {{
+        background-color: {accent_hex};
+    }}
+    QSlider::handle:horizontal {{
+        background: {accent_hex};
+        border: 1px solid #111;
+        width: 14px;
+        margin: -6px 0;
+        border-radius: 7px;
+    }}
+    """
+
+
+@functools.lru_cache(maxsize=4096)
+def _sec_to_mmss(seconds: int) -> str:
+    m, s = divmod(seconds, 60)
+    return f"{m:02d}:{s:02d}"
+
+
+def ms_to_mmss(ms: Optional[int]) -> str:
+    """
+    mm:ss formatting, cached on whole seconds: during steady playback the
+    same second is asked for several times per poll cycle, so most calls
+    are dict lookups instead of f-string builds.
+    """
+    if ms is None or ms <= 0:
+        return "--:--"
+    return _sec_to_mmss(ms // 1000)
+
 
 # ---------- Backend launcher ----------
 
@@ -51,6 +165,16 @@ def start_backend():
     project_root = Path(__file__).resolve().parent.parent
     backend_dir = project_root / "backend"
 
+    # uvloop + httptools swap uvicorn's default asyncio loop and h11
+    # parser for their C implementations — a solid per-request CPU win for
+    # the 1-2s polling workload. uvloop has no Windows build, so fall back
+    # to the stock loop there. --no-access-log drops the per-request
+    # stdout formatting entirely.
+    if sys.platform == "win32":
+        loop_impl = "asyncio"
+    else:
+        loop_impl = "uvloop"
+
     cmd = [
         sys.executable,
         "-m",
@@ -60,21 +184,76 @@ def start_backend():
         "127.0.0.1",
         "--port",
         "8000",
+        "--loop",
+        loop_impl,
+        "--http",
+        "httptools",
+        "--no-access-log",
     ]
 
     proc = subprocess.Popen(cmd, cwd=str(backend_dir))
     return proc
 
 
+# ---------- Album art decoding off the GUI thread ----------
+
+class _AlbumDecodeSignals(QObject):
+    decoded = Signal(str, QImage)
+
+
+class AlbumDecodeRunnable(QRunnable):
+    """
+    Decodes album-art JPEG bytes into a QImage on a worker thread so the
+    tens-of-ms decode never blocks the event loop; only the cheap
+    QPixmap conversion happens back on the GUI thread.
+
+    When a target size is given the JPEG is decoded straight to that
+    size (libjpeg scaled decode) — the full 640x640 frame is never
+    materialized, cutting both decode time and pixmap memory ~10x.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        data: QByteArray,
+        signals: _AlbumDecodeSignals,
+        target_size: Optional[QSize] = None,
+    ):
+        super().__init__()
+        self._url = url
+        self._data = data
+        self._signals = signals
+        self._target_size = target_size
+
+    def run(self):
+        buf = QBuffer()
+        buf.setData(self._data)
+        buf.open(QBuffer.ReadOnly)
+        reader = QImageReader(buf)
+
+        target = self._target_size
+        if target is not None and target.isValid():
+            src = reader.size()
+            if src.isValid() and (
+                src.width() > target.width() or src.height() > target.height()
+            ):
+                # setScaledSize doesn't keep aspect ratio on its own
+                reader.setScaledSize(src.scaled(target, Qt.KeepAspectRatio))
+
+        self._signals.decoded.emit(self._url, reader.read())
+
+
 # ---------- Simple EQ bars widget (vertical spikes) ----------
 
 class EqBarsWidget(QWidget):
     def __init__(self, parent=None, bar_color: QColor = QColor("#ff8844")):
         super().__init__(parent)
         self.num_bars = 18
-        self.values = [0.2 for _ in range(self.num_bars)]
+        self.values = np.full(self.num_bars, 0.2, dtype=np.float32)
+        self._rng = np.random.default_rng()
         self.bar_color = bar_color
         self.setMinimumHeight(26)
+        self._bar_geom = []  # (x, width) per bar, cached on resize
 
     def set_bar_color(self, color: QColor):
         self.bar_color = color
@@ -82,39 +261,42 @@ class EqBarsWidget(QWidget):
 
     def random_step(self):
         """Randomly jiggle bar heights a bit, then repaint."""
-        for i in range(self.num_bars):
-            delta = random.uniform(-0.15, 0.2)
-            self.values[i] = min(1.0, max(0.05, self.values[i] + delta))
+        deltas = self._rng.uniform(-0.15, 0.2, self.num_bars).astype(np.float32)
+        self.values = np.clip(self.values + deltas, 0.05, 1.0)
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, True)
-
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
         w = self.width()
-        h = self.height()
-        if w <= 0 or h <= 0:
+        if w <= 0:
+            self._bar_geom = []
             return
-
         bar_width = w / (self.num_bars * 1.5)
         spacing = bar_width * 0.5
+        # Floor to whole pixels so every bar lands on the pixel grid;
+        # antialiasing then has nothing to smooth and can stay off.
+        self._bar_geom = [
+            (int(i * (bar_width + spacing)), max(1, int(bar_width)))
+            for i in range(self.num_bars)
+        ]
 
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(self.bar_color))
-
-        for i, val in enumerate(self.values):
-            x = i * (bar_width + spacing)
-            bar_height = h * val
-            y = h - bar_height
-            painter.drawRoundedRect(
-                int(x),
-                int(y),
-                int(bar_width),
-                int(bar_height),
-                2,
-                2,
-            )
+    def paintEvent(self, event):
+        h = self.height()
+        if h <= 0 or not self._bar_geom:
+            return
+
+        # No Antialiasing hint: the geometry is pixel-aligned, so the AA
+        # coverage pass would only burn CPU at 60fps for identical output.
+        painter = QPainter(self)
+
+        # Batch all 18 bars into one path -> a single fill call instead
+        # of one drawRoundedRect (each its own tessellated path) per bar.
+        path = QPainterPath()
+        for (x, bar_width), val in zip(self._bar_geom, self.values.tolist()):
+            bar_height = int(h * val)
+            path.addRoundedRect(x, h - bar_height, bar_width, bar_height, 2, 2)
 
+        painter.fillPath(path, QBrush(self.bar_color))
         painter.end()
 
 class AnimatedCassetteFrame(QFrame):
@@ -129,50 +311,77 @@ class AnimatedCassetteFrame(QFrame):
         # We paint our own background
         self.setAttribute(Qt.WA_TranslucentBackground, True)
 
+        # Composite (gradient + overlay + glow + rounded mask) baked into
+        # one pixmap, rebuilt only when the 5° hue bucket or size changes.
+        self._bg_pix: Optional[QPixmap] = None
+        self._bg_key = None
+
+        # Rounded-corner mask geometry only depends on widget size, so it
+        # is rebuilt in resizeEvent rather than per frame render.
+        self._mask_path = QPainterPath()
+
     def set_hue(self, hue: float):
         self._hue = hue % 360.0
         self.update()
 
-    def paintEvent(self, event):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
-
-        r = self.rect()
-        if r.width() <= 0 or r.height() <= 0:
-            return
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        path = QPainterPath()
+        path.addRoundedRect(
+            self.rect().adjusted(1, 1, -1, -1), self._radius, self._radius
+        )
+        self._mask_path = path
 
-        radius = self._radius
+    def _render_frame(self, hue1: float, w: int, h: int) -> QPixmap:
+        img = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+        img.fill(Qt.transparent)
 
-        # Rounded clip path
-        path = QPainterPath()
-        path.addRoundedRect(r.adjusted(1, 1, -1, -1), radius, radius)
-        p.setClipPath(path)
+        p = QPainter(img)
+        p.setRenderHint(QPainter.Antialiasing, True)
 
         # --- Animated gradient fill (soft) ---
-        w, h = r.width(), r.height()
-        hue1 = self._hue
         hue2 = (hue1 + 120) % 360
         hue3 = (hue1 + 240) % 360
 
-        c1 = QColor.fromHsv(int(hue1), 180, 50)   # darkish
-        c2 = QColor.fromHsv(int(hue2), 200, 55)
-        c3 = QColor.fromHsv(int(hue3), 180, 45)
+        c1 = _CASSETTE_LUT_1[int(hue1) % 360]   # darkish
+        c2 = _CASSETTE_LUT_2[int(hue2) % 360]
+        c3 = _CASSETTE_LUT_3[int(hue3) % 360]
 
         grad = QLinearGradient(0, 0, w, h)
         grad.setColorAt(0.0, c1)
         grad.setColorAt(0.5, c2)
         grad.setColorAt(1.0, c3)
 
-        p.fillRect(r, grad)
+        p.fillRect(img.rect(), grad)
 
         # Dark overlay so elements stay readable
-        p.fillRect(r, QColor(0, 0, 0, 150))
+        p.fillRect(img.rect(), QColor(0, 0, 0, 150))
 
         # --- subtle inner glow ---
-        glow = QColor.fromHsv(int(hue1), 255, 255)
-        glow.setAlpha(45)
-        p.fillRect(r, glow)
+        p.fillRect(img.rect(), _CASSETTE_GLOW_LUT[int(hue1) % 360])
 
+        # Rounded corners via a mask pass: cheaper at paint time than a
+        # clip path, which would push every frame onto the slow path.
+        p.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+        p.fillPath(self._mask_path, QBrush(Qt.white))
+        p.end()
+        return QPixmap.fromImage(img)
+
+    def paintEvent(self, event):
+        r = self.rect()
+        if r.width() <= 0 or r.height() <= 0:
+            return
+
+        # 5° hue buckets: visually smooth, and consecutive 30 Hz frames
+        # nearly always reuse the cached composite.
+        bucket = int(self._hue / 5) % 72
+        key = (bucket, r.width(), r.height())
+        if self._bg_pix is None or key != self._bg_key:
+            self._bg_pix = self._render_frame(bucket * 5.0, r.width(), r.height())
+            self._bg_key = key
+
+        p = QPainter(self)
+        p.drawPixmap(0, 0, self._bg_pix)
         p.end()
 
 # ---------- Cassette-style now playing widget ----------
@@ -215,13 +424,14 @@ class CassetteNowPlayingWidget(QWidget):
         # Optional: tint the top strip slightly
         colors["top_strip"] = accent.lighter(160).name()
 
-        self.setStyleSheet(self._base_stylesheet.format(**colors))
+        self._apply_widget_styles(colors)
 
         # EQ bars update
         self.eq_widget.set_bar_color(QColor(colors["eq"]))
 
         # Rebuild reel pixmap so ring matches accent (see next step)
         self._reel_base_pixmap = self._create_reel_pixmap(72, ring_color=QColor(accent_hex))
+        self._rebuild_reel_cache()
         self._apply_reel_pixmap(self._reel_angle)
 
     def __init__(self, parent=None):
@@ -364,15 +574,32 @@ class CassetteNowPlayingWidget(QWidget):
         self._current_theme_name = "default"
         self._current_colors = self.themes["default"]
 
+        # Stylesheets are split so an accent change only restyles the few
+        # widgets that actually use the accent color, instead of forcing
+        # Qt to reparse one big sheet and repolish the whole subtree.
         self._base_stylesheet = """
         QLabel {{
             color: {text};
         }}
+        #centerPanel {{
+            background-color: #050505;
+            border-radius: 10px;
+            border: 1px solid #222222;
+        }}
+        #albumArt {{
+            border-radius: 8px;
+            border: 1px solid #444444;
+            background-color: #000000;
+        }}
+        """
+        self._frame_stylesheet = """
         #cassetteFrame {{
             background-color: {bg};
             border-radius: 16px;
             border: 1px solid {frame_border};
         }}
+        """
+        self._top_stylesheet = """
         #cassetteTop {{
             background-color: {top_strip};
             border-top-left-radius: 16px;
@@ -380,6 +607,8 @@ class CassetteNowPlayingWidget(QWidget):
             border-bottom-left-radius: 0px;
             border-bottom-right-radius: 0px;
         }}
+        """
+        self._reel_stylesheet = """
         #reel {{
             min-width: 72px;
             min-height: 72px;
@@ -389,16 +618,8 @@ class CassetteNowPlayingWidget(QWidget):
             border: 3px solid {reel_border};
             background-color: #202020;
         }}
-        #centerPanel {{
-            background-color: #050505;
-            border-radius: 10px;
-            border: 1px solid #222222;
-        }}
-        #albumArt {{
-            border-radius: 8px;
-            border: 1px solid #444444;
-            background-color: #000000;
-        }}
+        """
+        self._progress_stylesheet = """
         QProgressBar#songProgress {{
             background-color: #111111;
             border: 1px solid #333333;
@@ -408,19 +629,46 @@ class CassetteNowPlayingWidget(QWidget):
             background-color: {progress};
         }}
         """
-        self.apply_theme("default")
+        self.setStyleSheet(self._base_stylesheet.format(**self._current_colors))
+        self._apply_widget_styles(self._current_colors)
         self._accent: Optional[QColor] = None
         self._last_accent_hex: Optional[str] = None
+        self._last_accent_bucket: Optional[int] = None
 
         self._rgb_accent: Optional[QColor] = None
         self._rgb_hue: float = 0.0
+
+        # Formatted QSS per (theme, accent bucket): at most a few dozen
+        # distinct strings, so str.format never runs twice for the same look
+        self._qss_cache: dict = {}
+
+        # Last label texts, so update_track can skip redundant setText
+        self._last_title: Optional[str] = None
+        self._last_info: Optional[str] = None
+        self._last_tech: Optional[str] = None
+        self._last_time: Optional[str] = None
         self._reel_base_pixmap = self._create_reel_pixmap(72, ring_color=QColor(self._current_colors["reel_border"]))
+        self._rebuild_reel_cache()
         self._reel_angle = 0
         self._is_playing = False
 
-        self.reel_timer = QTimer(self)
-        self.reel_timer.setInterval(50)
-        self.reel_timer.timeout.connect(self._update_animation)
+        # The reel no longer owns a QTimer: the RgbBackground tick drives
+        # _advance_reel, and this accumulator keeps the original 50 ms
+        # cadence regardless of the driver's interval.
+        self._reel_accum = 0
+
+        # Album art scaling cache: SmoothTransformation is a full bilinear
+        # pass over the image, so reuse the scaled pixmap until the target
+        # size or the source pixmap actually changes. While a resize drag
+        # is in flight we scale with FastTransformation and schedule one
+        # smooth rescale for when the drag settles.
+        self._album_pixmap: Optional[QPixmap] = None
+        self._scaled_cache_key = None
+        self._scaled_pix = None
+        self._resize_settle = QTimer(self)
+        self._resize_settle.setSingleShot(True)
+        self._resize_settle.setInterval(200)
+        self._resize_settle.timeout.connect(self._smooth_rescale)
 
         self._apply_reel_pixmap(0)
 
@@ -442,9 +690,15 @@ class CassetteNowPlayingWidget(QWidget):
         if not self._rgb_accent:
             return
 
-        accent_hex = self._rgb_accent.lighter(120).name()
-        if accent_hex == self._last_accent_hex:
+        # Quantize the hue into 15° buckets: restyling only on a bucket
+        # change keeps sub-bucket hue drift from repolishing the widget
+        # tree every few frames.
+        bucket = int(self._rgb_hue / 15) % 24
+        if bucket == self._last_accent_bucket:
             return
+        self._last_accent_bucket = bucket
+
+        accent_hex = self._rgb_accent.lighter(120).name()
         self._last_accent_hex = accent_hex
         # Base theme colors + override highlights with RGB accent
         colors = dict(self._current_colors)
@@ -456,16 +710,46 @@ class CassetteNowPlayingWidget(QWidget):
         # optional top strip tint
         colors["top_strip"] = self._rgb_accent.lighter(170).name()
 
-        self.setStyleSheet(self._base_stylesheet.format(**colors))
+        self._apply_widget_styles(colors, cache_key=(self._current_theme_name, bucket))
         self.eq_widget.set_bar_color(QColor(colors["eq"]))
 
         # rebuild reel pixmap ring to match accent
         self._reel_base_pixmap = self._create_reel_pixmap(72, ring_color=QColor(accent_hex))
+        self._rebuild_reel_cache()
         self._apply_reel_pixmap(self._reel_angle)
 
 
     # ---------- theme handling ----------
 
+    def _format_widget_qss(self, colors: dict) -> tuple:
+        return (
+            self._frame_stylesheet.format(**colors),
+            self._top_stylesheet.format(**colors),
+            self._reel_stylesheet.format(**colors),
+            self._progress_stylesheet.format(**colors),
+        )
+
+    def _apply_widget_styles(self, colors: dict, cache_key=None):
+        """
+        Restyle only the accent-colored widgets (frame, top strip, reels,
+        progress bar); the rest of the subtree keeps its stylesheet.
+        With a cache_key, the formatted strings are memoized so the accent
+        hot path never re-runs str.format for a look it has shown before.
+        """
+        if cache_key is not None:
+            qss = self._qss_cache.get(cache_key)
+            if qss is None:
+                qss = self._qss_cache[cache_key] = self._format_widget_qss(colors)
+        else:
+            qss = self._format_widget_qss(colors)
+
+        frame_qss, top_qss, reel_qss, progress_qss = qss
+        self.cassette_frame.setStyleSheet(frame_qss)
+        self.cassette_top.setStyleSheet(top_qss)
+        self.left_reel.setStyleSheet(reel_qss)
+        self.right_reel.setStyleSheet(reel_qss)
+        self.mini_progress.setStyleSheet(progress_qss)
+
     def apply_theme(self, theme_name: str):
         if theme_name not in self.themes:
             theme_name = "default"
@@ -479,6 +763,7 @@ class CassetteNowPlayingWidget(QWidget):
 
         # Apply base theme
         self.setStyleSheet(self._base_stylesheet.format(**self._current_colors))
+        self._apply_widget_styles(self._current_colors, cache_key=(theme_name, None))
         self.eq_widget.set_bar_color(QColor(self._current_colors["eq"]))
 
         # If RGB sync is active, re-apply accent overrides ONCE
@@ -490,13 +775,16 @@ class CassetteNowPlayingWidget(QWidget):
     # ---------- reel drawing & animation ----------
 
     def _create_reel_pixmap(self, size: int, ring_color: QColor = QColor("#ff4a4a")) -> QPixmap:
-        pix = QPixmap(size, size)
-        pix.fill(Qt.transparent)
+        # Render into a premultiplied-alpha QImage: that is the format the
+        # raster engine composites natively, so the later drawPixmap calls
+        # skip a per-frame alpha conversion.
+        img = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+        img.fill(Qt.transparent)
         center = size / 2
         radius_outer = size / 2 - 4
         radius_inner = size / 4
 
-        painter = QPainter(pix)
+        painter = QPainter(img)
         painter.setRenderHint(QPainter.Antialiasing, True)
 
         # outer ring (use ring_color instead of hardcoded)
@@ -521,23 +809,19 @@ class CassetteNowPlayingWidget(QWidget):
 
         # spokes
         painter.setPen(QPen(QColor("#dddddd"), 2))
-        for angle in range(0, 360, 45):
-            rad = math.radians(angle)
-            x1 = center + radius_inner * 0.5 * math.cos(rad)
-            y1 = center + radius_inner * 0.5 * math.sin(rad)
-            x2 = center + (radius_outer - 4) * math.cos(rad)
-            y2 = center + (radius_outer - 4) * math.sin(rad)
+        for cos_a, sin_a in _SPOKE_TRIG:
+            x1 = center + radius_inner * 0.5 * cos_a
+            y1 = center + radius_inner * 0.5 * sin_a
+            x2 = center + (radius_outer - 4) * cos_a
+            y2 = center + (radius_outer - 4) * sin_a
             painter.drawLine(int(x1), int(y1), int(x2), int(y2))
 
         painter.end()
-        return pix
+        return QPixmap.fromImage(img)
 
 
-    def _apply_reel_pixmap(self, angle_degrees: float):
-        base = self._reel_base_pixmap
-        if base is None:
-            return
-
+    @staticmethod
+    def _rotate_pixmap(base: QPixmap, angle_degrees: float) -> QPixmap:
         size = base.size()
         out = QPixmap(size)
         out.fill(Qt.transparent)
@@ -552,17 +836,51 @@ class CassetteNowPlayingWidget(QWidget):
         p.translate(-size.width() / 2, -size.height() / 2)
         p.drawPixmap(0, 0, base)
         p.end()
+        return out
 
-        self.left_reel.setPixmap(out)
-        self.right_reel.setPixmap(out)
+    def _rebuild_reel_cache(self):
+        """
+        Pre-rotate the reel for all 60 animation angles. The spin only
+        ever hits these discrete angles, so the 20 Hz tick becomes a
+        list lookup instead of a QPainter rotation per frame.
+        """
+        base = self._reel_base_pixmap
+        if base is None:
+            self._rotated_cache = []
+            return
+        self._rotated_cache = [
+            self._rotate_pixmap(base, angle) for angle in range(0, 360, 6)
+        ]
+
+    def _apply_reel_pixmap(self, angle_degrees: float):
+        cache = self._rotated_cache
+        if not cache:
+            return
+        pix = cache[int(angle_degrees / 6) % len(cache)]
+        self.left_reel.setPixmap(pix)
+        self.right_reel.setPixmap(pix)
 
 
-    def _update_animation(self):
+    def _advance_reel(self, elapsed_ms: int = 33):
+        """
+        Driven by the shared RgbBackground tick. Accumulates elapsed time
+        and only advances the 6°-per-50ms reel animation when due, so one
+        timer serves both the gradient and the reels.
+        """
         if not self._is_playing:
             return
+        # Occluded or scrolled off-screen: skip the pixmap swaps entirely
+        if not self.isVisible() or self.visibleRegion().isEmpty():
+            return
+
+        self._reel_accum += elapsed_ms
+        if self._reel_accum < 50:
+            return
+        while self._reel_accum >= 50:
+            self._reel_accum -= 50
+            self._reel_angle = (self._reel_angle + 6) % 360
 
         # spin reels
-        self._reel_angle = (self._reel_angle + 6) % 360
         self._apply_reel_pixmap(self._reel_angle)
 
         # jiggle EQ bars
@@ -570,50 +888,64 @@ class CassetteNowPlayingWidget(QWidget):
 
     def set_playing_state(self, is_playing: bool):
         self._is_playing = is_playing
-        if is_playing:
-            if not self.reel_timer.isActive():
-                self.reel_timer.start()
-        else:
-            self.reel_timer.stop()
+        if not is_playing:
+            self._reel_accum = 0
             self._apply_reel_pixmap(0)
 
     # ---------- album art helpers ----------
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # reapply scaling on resize
-        if hasattr(self, "_album_pixmap") and self._album_pixmap is not None:
-            self._apply_album_pixmap()
+        # reapply scaling on resize: fast during the drag, smooth once
+        # the size has settled
+        if self._album_pixmap is not None:
+            self._apply_album_pixmap(fast=True)
+            self._resize_settle.start()
+
+    def art_target_size(self) -> QSize:
+        """Size the decoder should aim for; falls back before first layout."""
+        size = self.album_label.size()
+        if size.width() <= 0 or size.height() <= 0:
+            return QSize(160, 160)
+        return size
 
     def set_album_art(self, pixmap: Optional[QPixmap]):
         self._album_pixmap = pixmap
         self._apply_album_pixmap()
 
-    def _apply_album_pixmap(self):
-        if not hasattr(self, "_album_pixmap") or self._album_pixmap is None:
+    def _smooth_rescale(self):
+        if self._album_pixmap is not None:
+            self._apply_album_pixmap()
+
+    def _apply_album_pixmap(self, fast: bool = False):
+        if self._album_pixmap is None:
             self.album_label.clear()
             return
         target_size = self.album_label.size()
         if target_size.width() <= 0 or target_size.height() <= 0:
             self.album_label.setPixmap(self._album_pixmap)
             return
+
+        key = (target_size.width(), target_size.height(), id(self._album_pixmap))
+        if not fast and key == self._scaled_cache_key and self._scaled_pix is not None:
+            self.album_label.setPixmap(self._scaled_pix)
+            return
+
         scaled = self._album_pixmap.scaled(
             target_size,
             Qt.KeepAspectRatio,
-            Qt.SmoothTransformation,
+            Qt.FastTransformation if fast else Qt.SmoothTransformation,
         )
+        if not fast:
+            self._scaled_cache_key = key
+            self._scaled_pix = scaled
         self.album_label.setPixmap(scaled)
 
     # ---------- helpers ----------
 
     @staticmethod
     def ms_to_mmss(ms: Optional[int]) -> str:
-        if ms is None or ms <= 0:
-            return "--:--"
-        seconds = int(ms / 1000)
-        m = seconds // 60
-        s = seconds % 60
-        return f"{m:02d}:{s:02d}"
+        return ms_to_mmss(ms)
 
     def update_track(
         self,
@@ -628,14 +960,23 @@ class CassetteNowPlayingWidget(QWidget):
         Update basic info + theme + progress.
         genre_hint: simple string like 'rock', 'edm', 'chill', 'jazz'
         """
-        # title & info
-        self.title_label.setText(title or "Unknown track")
+        # title & info — dirty-checked: every setText invalidates layout
+        # and repaints, and on a steady-state track nothing here changes
+        # between polls.
+        title_text = title or "Unknown track"
+        if title_text != self._last_title:
+            self._last_title = title_text
+            self.title_label.setText(title_text)
+
         info_parts = []
         if artists:
             info_parts.append(artists)
         if album:
             info_parts.append(album)
-        self.info_label.setText(" — ".join(info_parts) if info_parts else "")
+        info_text = " — ".join(info_parts) if info_parts else ""
+        if info_text != self._last_info:
+            self._last_info = info_text
+            self.info_label.setText(info_text)
 
         # theme based on hint
         theme_map = {
@@ -667,12 +1008,24 @@ class CassetteNowPlayingWidget(QWidget):
             "jazz": "🎷 Jazz Lounge",
             "default": "🎧 Spotify • Streaming",
         }[theme_name]
-        self.tech_label.setText(f"{mood_label}  •  44.1kHz • 320kbps (virtual)")
+        tech_text = f"{mood_label}  •  44.1kHz • 320kbps (virtual)"
+        if tech_text != self._last_tech:
+            self._last_tech = tech_text
+            self.tech_label.setText(tech_text)
 
         # time / progress
-        elapsed_str = self.ms_to_mmss(progress_ms)
-        total_str = self.ms_to_mmss(duration_ms)
-        self.time_label.setText(f"{elapsed_str} / {total_str}")
+        self.update_progress(progress_ms, duration_ms)
+
+    def update_progress(self, progress_ms: int, duration_ms: int):
+        """
+        Cheap per-tick refresh of just the time label and mini progress
+        bar, so the cassette clock can ride the window's interpolated
+        100ms tick between polls; update_track handles everything else.
+        """
+        time_text = f"{ms_to_mmss(progress_ms)} / {ms_to_mmss(duration_ms)}"
+        if time_text != self._last_time:
+            self._last_time = time_text
+            self.time_label.setText(time_text)
 
         if duration_ms and duration_ms > 0:
             fraction = progress_ms / float(duration_ms)
@@ -684,7 +1037,14 @@ class RgbBackground(QWidget):
     """
     A QWidget that paints a smooth animated RGB gradient like a gaming keyboard.
     Put your whole UI layout inside it.
+
+    Its timer is also the single animation driver for the window: the
+    `ticked` signal lets the cassette reels ride the same 30 Hz tick
+    instead of running a second QTimer.
     """
+
+    ticked = Signal(int)  # elapsed ms per tick
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._t = 0.0
@@ -697,54 +1057,120 @@ class RgbBackground(QWidget):
 
         # Make sure we actually paint the background
         self.setAttribute(Qt.WA_OpaquePaintEvent, True)
-        self.accentChanged = None  # callback you can set from outside
+        self.accentChanged = None  # callback you can set from outside (property below)
+
+        # Cached gradient frame: rebuilt only when the (quantized) hue or
+        # the widget size changes, instead of on every paint.
+        self._grad_cache_hue = -1
+        self._grad_pix = None
+
+        # Throttle accent callbacks to ~5 Hz: stylesheet/reel rebuilds in
+        # the listeners are far more expensive than the paint itself.
+        self._accent_last_emit = 0.0
+
+    @property
+    def accentChanged(self):
+        return self._accent_cb
+
+    @accentChanged.setter
+    def accentChanged(self, cb):
+        # Introspect the callback once at assignment: inspect.signature is
+        # far too heavy to run inside the 30 Hz tick.
+        self._accent_cb = cb
+        if cb is None:
+            self._accent_arity = 0
+            return
+        try:
+            self._accent_arity = len(inspect.signature(cb).parameters)
+        except (TypeError, ValueError):
+            self._accent_arity = 1
 
     def _tick(self):
+        # Fully occluded (e.g. another window on top): let Qt's occlusion
+        # info short-circuit the whole frame, repaint and reels alike.
+        if not self.isVisible() or self.visibleRegion().isEmpty():
+            return
+
         self._t += self._speed * 0.02
         self.update()
+        self.ticked.emit(self._timer.interval())
 
-        if self.accentChanged:
+        cb = self._accent_cb
+        if cb and (self._t - self._accent_last_emit) > 0.2:
+            self._accent_last_emit = self._t
             hue = (self._t * 60) % 360
-            accent = QColor.fromHsv(int(hue), 255, 255)
+            accent = _ACCENT_LUT[int(hue) % 360]
 
             # Call with 2 args if callback supports it, else 1 arg
             try:
-                if len(inspect.signature(self.accentChanged).parameters) >= 2:
-                    self.accentChanged(accent, hue)
+                if self._accent_arity >= 2:
+                    cb(accent, hue)
                 else:
-                    self.accentChanged(accent)
+                    cb(accent)
             except Exception:
-                self.accentChanged(accent)
+                cb(accent)
 
 
 
-    def paintEvent(self, event):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
+    def stop_animation(self):
+        self._timer.stop()
 
-        w, h = self.width(), self.height()
-        if w <= 0 or h <= 0:
-            return
+    def start_animation(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def hideEvent(self, event):
+        # The 30 Hz gradient tick is pure waste while hidden.
+        super().hideEvent(event)
+        self._timer.stop()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.start_animation()
+
+    def _render_gradient(self, hue1: float, w: int, h: int) -> QPixmap:
         # Rotate colors through HSV for smooth cycling
-        hue1 = (self._t * 60) % 360
         hue2 = (hue1 + 120) % 360
         hue3 = (hue1 + 240) % 360
 
-        c1 = QColor.fromHsv(int(hue1), 200, 50)   # darker, not neon-blinding
-        c2 = QColor.fromHsv(int(hue2), 220, 55)
-        c3 = QColor.fromHsv(int(hue3), 200, 45)
+        c1 = _BG_LUT_1[int(hue1) % 360]   # darker, not neon-blinding
+        c2 = _BG_LUT_2[int(hue2) % 360]
+        c3 = _BG_LUT_3[int(hue3) % 360]
 
         grad = QLinearGradient(0, 0, w, h)
         grad.setColorAt(0.0, c1)
         grad.setColorAt(0.5, c2)
         grad.setColorAt(1.0, c3)
 
-        p.fillRect(self.rect(), grad)
+        pix = QPixmap(w, h)
+        p = QPainter(pix)
+        p.fillRect(pix.rect(), grad)
+        # Bake in the dark overlay so text stays readable without a
+        # second full-window fillRect per frame
+        p.fillRect(pix.rect(), QColor(0, 0, 0, 140))
+        p.end()
+        return pix
 
-        # Add a subtle dark overlay so text stays readable
-        p.fillRect(self.rect(), QColor(0, 0, 0, 140))
+    def paintEvent(self, event):
+        w, h = self.width(), self.height()
+        if w <= 0 or h <= 0:
+            return
 
+        hue1 = (self._t * 60) % 360
+        # Quantize to 2°: visually identical, but consecutive frames can
+        # reuse the cached gradient pixmap instead of rebuilding it.
+        bucket = int(hue1 / 2)
+        if (
+            self._grad_pix is None
+            or bucket != self._grad_cache_hue
+            or self._grad_pix.width() != w
+            or self._grad_pix.height() != h
+        ):
+            self._grad_pix = self._render_gradient(bucket * 2.0, w, h)
+            self._grad_cache_hue = bucket
+
+        p = QPainter(self)
+        p.drawPixmap(0, 0, self._grad_pix)
         p.end()
 
 # ---------- Main window ----------
@@ -763,17 +1189,40 @@ class SpotifyPlayerWindow(QMainWindow):
         self.current_playlist_url: Optional[str] = None
         self.shuffle_state: bool = False
         self.last_track_id: Optional[str] = None
-
-        # --- Async playback polling (prevents UI freezing) ---
-        self.playback_net = QNetworkAccessManager(self)
-        self.playback_net.finished.connect(self._on_playback_reply)
+        self._genre_hint: Optional[str] = None
+        self._last_state_sig: Optional[tuple] = None
+
+        # --- Shared network manager (playback / bootstrap / controls / art) ---
+        # One QNAM, as Qt recommends: each manager keeps its own connection
+        # pool and cookie jar, so the previous four-manager split paid the
+        # keep-alive bookkeeping four times over. Every reply carries a
+        # "role" property set at request time; _on_net_reply routes it to
+        # the matching handler.
+        self.net = QNetworkAccessManager(self)
+        self.net.finished.connect(self._on_net_reply)
         self._pending_album_url = None
+        self._album_reply: Optional[QNetworkReply] = None
         self._playback_in_flight = False
         self._last_is_playing = False  # keep last state so play/pause doesn't need a blocking GET
 
-        # --- Async album art (prevents freezes on track change) ---
-        self.album_net = QNetworkAccessManager(self)
-        self.album_net.finished.connect(self._on_album_art_reply)
+        # Persistent disk cache: covers survive restarts, so a relaunch
+        # serves art locally instead of re-paying TLS + download per URL.
+        # Spotify's CDN sends cacheable headers; QNAM honors them and
+        # still emits finished() on hits. Backend replies carry no cache
+        # headers, so sharing the cache with 127.0.0.1 traffic is free.
+        art_cache = QNetworkDiskCache(self)
+        art_cache.setCacheDirectory(
+            QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+            + "/albumart"
+        )
+        art_cache.setMaximumCacheSize(100 * 1024 * 1024)
+        self.net.setCache(art_cache)
+
+        # JPEG decode happens on this small worker pool, not the GUI thread
+        self._art_pool = QThreadPool(self)
+        self._art_pool.setMaxThreadCount(2)
+        self._art_signals = _AlbumDecodeSignals()
+        self._art_signals.decoded.connect(self._on_album_art_decoded)
 
         # --- Cassette-style now playing with album art inside ---
         self.cassette_widget = CassetteNowPlayingWidget()
@@ -924,34 +1373,20 @@ class SpotifyPlayerWindow(QMainWindow):
         container = RgbBackground()
         container.setLayout(root_layout)
         self.setCentralWidget(container)
+        self.rgb_background = container
 
         # ---- RGB accent hookup (paste this right here) ----
+        self._last_accent_qss_hex: Optional[str] = None
+
         def _apply_accent(accent: QColor, hue: float = 0.0):
             accent_hex = accent.lighter(120).name()
 
-            # Apply globally so it doesn't get "lost"
-            QApplication.instance().setStyleSheet(f"""
-            QPushButton {{
-                background: rgba(30,30,30,180);
-                border: 1px solid {accent_hex};
-                border-radius: 8px;
-                padding: 6px 10px;
-                color: #eee;
-            }}
-            QPushButton:hover {{
-                background: rgba(50,50,50,210);
-            }}
-            QProgressBar#songProgress::chunk {{
-                background-color: {accent_hex};
-            }}
-            QSlider::handle:horizontal {{
-                background: {accent_hex};
-                border: 1px solid #111;
-                width: 14px;
-                margin: -6px 0;
-                border-radius: 7px;
-            }}
-            """)
+            # Scope to the root container: the style cascade then walks
+            # only this window's widgets instead of every widget in the
+            # application — and only when the hex actually changed.
+            if accent_hex != self._last_accent_qss_hex:
+                self._last_accent_qss_hex = accent_hex
+                container.setStyleSheet(_accent_qss(accent_hex))
 
             # ✅ Keep cassette in sync with exact same RGB phase
             self.cassette_widget.set_rgb_sync(accent, hue)
@@ -963,24 +1398,118 @@ class SpotifyPlayerWindow(QMainWindow):
         bg = self.centralWidget()
         if isinstance(bg, RgbBackground):
             bg.accentChanged = _apply_accent
+            # Single animation driver: reels advance on the same tick
+            bg.ticked.connect(self.cassette_widget._advance_reel)
         # -----------------------------------------------
 
 
-        # Timer to refresh playback info every 2 seconds
+        # Network reconciliation poll. The progress display itself runs
+        # off the local interpolator below, so 5 s polling is plenty —
+        # the backend only corrects drift and catches external changes.
         self.timer = QTimer(self)
-        self.timer.setInterval(2000)
+        self.timer.setInterval(5000)
         self.timer.timeout.connect(self.fetch_playback_state)
         self.timer.start()
 
-        # Initial loads
-        self.fetch_playback_state()
-        self.load_devices()
-        self.load_playlists()
-        self.load_queue()
+        # Local progress clock: advances the slider/label every 100 ms
+        # from monotonic time instead of asking the network what time it is
+        self._local_progress_ms = 0.0
+        self._last_tick_t = time.monotonic()
+        self._ui_tick = QTimer(self)
+        self._ui_tick.setInterval(100)
+        self._ui_tick.timeout.connect(self._tick_ui)
+        self._ui_tick.start()
+
+        # Debounce user-triggered refreshes: play/pause + next in quick
+        # succession coalesce into one /playback/state request.
+        self._refresh_debounce = QTimer(self)
+        self._refresh_debounce.setSingleShot(True)
+        self._refresh_debounce.setInterval(250)
+        self._refresh_debounce.timeout.connect(self.fetch_playback_state)
+
+        # Poll slower when the user is in another app
+        QApplication.instance().applicationStateChanged.connect(
+            self._on_app_state_changed
+        )
+
+        # Initial load: one non-blocking /bootstrap GET — the backend
+        # gathers playback + devices + playlists + queue concurrently,
+        # so no separate state poll is needed and the window paints
+        # immediately.
+        self.load_bootstrap()
 
 
 
 
+    def changeEvent(self, event):
+        # Minimizing doesn't hide the child widgets, so cascade the
+        # animation pause/resume to both timer-driven painters here.
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.rgb_background.stop_animation()
+            else:
+                self.rgb_background.start_animation()
+        super().changeEvent(event)
+
+    def _on_app_state_changed(self, state):
+        if state == Qt.ApplicationActive:
+            self.timer.setInterval(5000)
+            if self.isVisible() and not self.timer.isActive():
+                self.timer.start()
+                self.fetch_playback_state()  # catch up immediately
+        elif state in (Qt.ApplicationSuspended, Qt.ApplicationHidden):
+            # Nothing to show anyone: no network, no JSON, no repaints
+            self.timer.stop()
+        else:  # ApplicationInactive: visible but not focused
+            self.timer.setInterval(10000)
+
+    def _tick_ui(self):
+        now = time.monotonic()
+        dt_ms = (now - self._last_tick_t) * 1000.0
+        self._last_tick_t = now
+
+        duration_ms = self.current_track_duration_ms
+        if not self._last_is_playing or duration_ms <= 0:
+            return
+
+        self._local_progress_ms = min(
+            self._local_progress_ms + dt_ms, float(duration_ms)
+        )
+        progress = int(self._local_progress_ms)
+
+        time_text = f"{ms_to_mmss(progress)} / {ms_to_mmss(duration_ms)}"
+        if time_text != self.time_label.text():
+            self.time_label.setText(time_text)
+
+        if not self.progress_slider_is_dragging:
+            self.progress_slider.setValue(int(progress / duration_ms * 1000))
+
+        # The cassette keeps its own clock + mini bar; without this it
+        # would only advance on the (slow) poll and visibly jump.
+        self.cassette_widget.update_progress(progress, duration_ms)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+        self._ui_tick.stop()
+        self._refresh_debounce.stop()
+        # Freeze the reels too; the poll restarting on show will put the
+        # animation back in the right state.
+        self.cassette_widget.set_playing_state(False)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.timer.isActive():
+            self.timer.start()
+            self.fetch_playback_state()
+        self._last_tick_t = time.monotonic()
+        if not self._ui_tick.isActive():
+            self._ui_tick.start()
+
+    def _schedule_playback_refresh(self):
+        if not self._refresh_debounce.isActive():
+            self._refresh_debounce.start()
+
     def fetch_playback_state(self):
         # Don't stack requests if the backend/Spotify is slow
         if self._playback_in_flight:
@@ -990,8 +1519,23 @@ class SpotifyPlayerWindow(QMainWindow):
         url = f"{api_client.BASE_URL}/playback/state"
         req = QNetworkRequest(QUrl(url))
         req.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
-        self.playback_net.get(req)
-
+        reply = self.net.get(req)
+        reply.setProperty("role", "playback")
+
+    def _on_net_reply(self, reply):
+        # finished() fan-out for the shared manager; unknown roles can
+        # only come from aborted/stray replies.
+        role = reply.property("role")
+        if role == "playback":
+            self._on_playback_reply(reply)
+        elif role == "album":
+            self._on_album_art_reply(reply)
+        elif role == "bootstrap":
+            self._on_bootstrap_reply(reply)
+        elif role == "ctrl":
+            self._on_ctrl_reply(reply)
+        else:
+            reply.deleteLater()
 
     def _on_playback_reply(self, reply):
         self._playback_in_flight = False
@@ -1001,13 +1545,16 @@ class SpotifyPlayerWindow(QMainWindow):
                 self._apply_playback_error(str(reply.errorString()))
                 return
 
-            raw = bytes(reply.readAll())
-            if not raw:
+            raw = reply.readAll()  # QByteArray; skip the bytes() copy
+            if raw.isEmpty():
                 # backend returned empty body; treat as "no playback"
                 self.apply_playback_state({})
                 return
 
-            playback = json.loads(raw.decode("utf-8"))
+            # orjson reads the QByteArray through the buffer protocol —
+            # zero-copy, unlike .data() which returns a fresh bytes —
+            # and the C parser matches what api_client uses.
+            playback = orjson.loads(memoryview(raw))
             if playback is None:
                 playback = {}
             self.apply_playback_state(playback)
@@ -1019,6 +1566,9 @@ class SpotifyPlayerWindow(QMainWindow):
 
     def _on_album_art_reply(self, reply):
         try:
+            if reply is self._album_reply:
+                self._album_reply = None
+
             url = reply.url().toString()
             if url != self._pending_album_url:
                 return
@@ -1027,17 +1577,31 @@ class SpotifyPlayerWindow(QMainWindow):
                 self.cassette_widget.set_album_art(None)
                 return
 
-            data = bytes(reply.readAll())
-            pixmap = QPixmap()
-            if not pixmap.loadFromData(data):
-                self.cassette_widget.set_album_art(None)
-                return
-
-            self.cassette_widget.set_album_art(pixmap)
+            # QBuffer.setData takes the QByteArray as-is; for a 640x640
+            # cover that skips a few-hundred-KB memcpy per track change.
+            self._art_pool.start(
+                AlbumDecodeRunnable(
+                    url,
+                    reply.readAll(),
+                    self._art_signals,
+                    target_size=self.cassette_widget.art_target_size(),
+                )
+            )
 
         finally:
             reply.deleteLater()
 
+    def _on_album_art_decoded(self, url: str, image: QImage):
+        # Worker finished; drop the result if the track changed meanwhile
+        if url != self._pending_album_url:
+            return
+        if image.isNull():
+            self.cassette_widget.set_album_art(None)
+            return
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(url, pixmap)
+        self.cassette_widget.set_album_art(pixmap)
+
 
 
     # ---------- Album art helper (now feeds cassette) ----------
@@ -1052,8 +1616,26 @@ class SpotifyPlayerWindow(QMainWindow):
             return
 
         self._pending_album_url = url
+
+        # Covers repeat constantly when skipping within an album/playlist;
+        # a QPixmapCache hit skips both the network fetch and the decode.
+        cached = QPixmap()
+        if QPixmapCache.find(url, cached):
+            self.cassette_widget.set_album_art(cached)
+            return
+
+        # Rapid track-skipping: kill the superseded download instead of
+        # letting it finish, freeing the connection and the decode slot.
+        if self._album_reply is not None and self._album_reply.isRunning():
+            self._album_reply.abort()
+
         req = QNetworkRequest(QUrl(url))
-        self.album_net.get(req)
+        req.setAttribute(
+            QNetworkRequest.CacheLoadControlAttribute,
+            QNetworkRequest.PreferCache,
+        )
+        self._album_reply = self.net.get(req)
+        self._album_reply.setProperty("role", "album")
 
 
 
@@ -1077,22 +1659,55 @@ class SpotifyPlayerWindow(QMainWindow):
         self.status_label.setText(f"Backend error: {msg}")
 
 
+    # ---------- Bootstrap (batched startup fetch) ----------
+
+    def load_bootstrap(self):
+        req = QNetworkRequest(QUrl(f"{api_client.BASE_URL}/bootstrap"))
+        reply = self.net.get(req)
+        reply.setProperty("role", "bootstrap")
+
+    def _on_bootstrap_reply(self, reply):
+        try:
+            if reply.error() != QNetworkReply.NetworkError.NoError:
+                self.status_label.setText(
+                    f"Error loading dashboard: {reply.errorString()}"
+                )
+                return
+            raw = reply.readAll()
+            data = orjson.loads(memoryview(raw) if not raw.isEmpty() else b"{}")
+            self.apply_playback_state(data.get("state") or {})
+            self._apply_devices(data.get("devices", []))
+            self._apply_playlists(data.get("playlists", []))
+            self._apply_queue(data.get("queue", []))
+        except Exception as e:
+            self.status_label.setText(f"Error loading dashboard: {e}")
+        finally:
+            reply.deleteLater()
+
     # ---------- Queue helpers ----------
 
     def load_queue(self):
         try:
             data = api_client.get_queue()
-            queue_items = data.get("queue", []) if data else []
         except Exception as e:
             self.status_label.setText(f"Error loading queue: {e}")
             return
+        self._apply_queue(data.get("queue", []) if data else [])
 
-        self.queue_list.clear()
-        for tr in queue_items:
-            text = f"{tr.get('artists', '')} — {tr.get('name', '')}"
-            item = QListWidgetItem(text)
-            item.setData(Qt.UserRole, tr.get("uri"))
-            self.queue_list.addItem(item)
+    def _apply_queue(self, queue_items):
+        # One relayout for the whole rebuild instead of one per addItem
+        self.queue_list.setUpdatesEnabled(False)
+        self.queue_list.blockSignals(True)
+        try:
+            self.queue_list.clear()
+            for tr in queue_items:
+                text = f"{tr.get('artists', '')} — {tr.get('name', '')}"
+                item = QListWidgetItem(text)
+                item.setData(Qt.UserRole, tr.get("uri"))
+                self.queue_list.addItem(item)
+        finally:
+            self.queue_list.blockSignals(False)
+            self.queue_list.setUpdatesEnabled(True)
 
     def on_clear_queue(self):
         try:
@@ -1106,36 +1721,51 @@ class SpotifyPlayerWindow(QMainWindow):
 
     # ---------- UI callbacks: playback ----------
 
-    def on_prev_clicked(self):
-        try:
-            api_client.previous_track()
-            self.status_label.setText("Previous track")
-        except Exception as e:
-            self.status_label.setText(f"Error previous: {e}")
-        self.fetch_playback_state()
+    # Success status per control endpoint, also used to route replies
+    _CTRL_STATUS = {
+        "/playback/previous": "Previous track",
+        "/playback/play": "Play",
+        "/playback/pause": "Pause",
+        "/playback/next": "Next track",
+        "/playback/seek": "Seek",
+    }
+
+    def _ctrl_post(self, path: str, body: bytes = b""):
+        req = QNetworkRequest(QUrl(f"{api_client.BASE_URL}{path}"))
+        req.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+        reply = self.net.post(req, body)
+        reply.setProperty("role", "ctrl")
 
-    def on_play_pause_clicked(self):
+    def _on_ctrl_reply(self, reply):
         try:
-            if self._last_is_playing:
-                api_client.pause()
-                self.status_label.setText("Pause")
-            else:
-                api_client.play()
-                self.status_label.setText("Play")
-        except Exception as e:
-            self.status_label.setText(f"Error play/pause: {e}")
+            path = reply.url().path()
+            if reply.error() != QNetworkReply.NetworkError.NoError:
+                self.status_label.setText(
+                    f"Error {path.rsplit('/', 1)[-1]}: {reply.errorString()}"
+                )
+                return
 
-        # Ask for fresh state (async)
-        self.fetch_playback_state()
+            label = self._CTRL_STATUS.get(path)
+            if label:
+                self.status_label.setText(label)
 
+            # The reply itself is the completion signal — one debounced
+            # refresh replaces the fire-and-hope poll per handler.
+            self._schedule_playback_refresh()
+        finally:
+            reply.deleteLater()
+
+    def on_prev_clicked(self):
+        self._ctrl_post("/playback/previous")
+
+    def on_play_pause_clicked(self):
+        if self._last_is_playing:
+            self._ctrl_post("/playback/pause")
+        else:
+            self._ctrl_post("/playback/play")
 
     def on_next_clicked(self):
-        try:
-            api_client.next_track()
-            self.status_label.setText("Next track")
-        except Exception as e:
-            self.status_label.setText(f"Error next: {e}")
-        self.fetch_playback_state()
+        self._ctrl_post("/playback/next")
 
     def on_slider_pressed(self):
         self.progress_slider_is_dragging = True
@@ -1149,13 +1779,10 @@ class SpotifyPlayerWindow(QMainWindow):
         fraction = value / 1000.0
         new_pos_ms = int(self.current_track_duration_ms * fraction)
 
-        try:
-            api_client.seek(new_pos_ms)
-            self.status_label.setText("Seek")
-        except Exception as e:
-            self.status_label.setText(f"Error seek: {e}")
-
-        self.fetch_playback_state()
+        self._ctrl_post(
+            "/playback/seek",
+            json.dumps({"position_ms": new_pos_ms}).encode("utf-8"),
+        )
 
     # ---------- Volume / shuffle / repeat ----------
 
@@ -1194,23 +1821,26 @@ class SpotifyPlayerWindow(QMainWindow):
     def load_devices(self):
         try:
             data = api_client.get_devices()
-            devices = data.get("devices", []) if data else []
         except Exception as e:
             self.status_label.setText(f"Error loading devices: {e}")
             return
+        self._apply_devices(data.get("devices", []) if data else [])
 
+    def _apply_devices(self, devices):
+        self.device_combo.setUpdatesEnabled(False)
         self.device_combo.blockSignals(True)
-        self.device_combo.clear()
-
-        for d in devices:
-            name = d.get("name") or "Unknown device"
-            device_id = d.get("id")
-            label = name
-            if d.get("is_active"):
-                label += " (active)"
-            self.device_combo.addItem(label, userData=device_id)
-
-        self.device_combo.blockSignals(False)
+        try:
+            self.device_combo.clear()
+            for d in devices:
+                name = d.get("name") or "Unknown device"
+                device_id = d.get("id")
+                label = name
+                if d.get("is_active"):
+                    label += " (active)"
+                self.device_combo.addItem(label, userData=device_id)
+        finally:
+            self.device_combo.blockSignals(False)
+            self.device_combo.setUpdatesEnabled(True)
 
     def on_device_changed(self, index: int):
         device_id = self.device_combo.itemData(index)
@@ -1227,19 +1857,26 @@ class SpotifyPlayerWindow(QMainWindow):
     def load_playlists(self):
         try:
             data = api_client.get_playlists()
-            playlists = data.get("playlists", []) if data else []
         except Exception as e:
             self.status_label.setText(f"Error loading playlists: {e}")
             return
+        self._apply_playlists(data.get("playlists", []) if data else [])
 
-        self.playlist_list.clear()
-        for pl in playlists:
-            name = pl.get("name") or "Unnamed"
-            total = pl.get("tracks_total") or 0
-            item = QListWidgetItem(f"{name} ({total})")
-            item.setData(Qt.UserRole, pl.get("id"))
-            item.setData(Qt.UserRole + 1, pl.get("external_url"))
-            self.playlist_list.addItem(item)
+    def _apply_playlists(self, playlists):
+        self.playlist_list.setUpdatesEnabled(False)
+        self.playlist_list.blockSignals(True)
+        try:
+            self.playlist_list.clear()
+            for pl in playlists:
+                name = pl.get("name") or "Unnamed"
+                total = pl.get("tracks_total") or 0
+                item = QListWidgetItem(f"{name} ({total})")
+                item.setData(Qt.UserRole, pl.get("id"))
+                item.setData(Qt.UserRole + 1, pl.get("external_url"))
+                self.playlist_list.addItem(item)
+        finally:
+            self.playlist_list.blockSignals(False)
+            self.playlist_list.setUpdatesEnabled(True)
 
     def on_playlist_selected(self):
         items = self.playlist_list.selectedItems()
@@ -1264,12 +1901,18 @@ class SpotifyPlayerWindow(QMainWindow):
             self.status_label.setText(f"Error loading tracks: {e}")
             return
 
-        self.playlist_tracks.clear()
-        for tr in tracks:
-            text = f"{tr.get('artists', '')} — {tr.get('name', '')}"
-            item = QListWidgetItem(text)
-            item.setData(Qt.UserRole, tr.get("uri"))
-            self.playlist_tracks.addItem(item)
+        self.playlist_tracks.setUpdatesEnabled(False)
+        self.playlist_tracks.blockSignals(True)
+        try:
+            self.playlist_tracks.clear()
+            for tr in tracks:
+                text = f"{tr.get('artists', '')} — {tr.get('name', '')}"
+                item = QListWidgetItem(text)
+                item.setData(Qt.UserRole, tr.get("uri"))
+                self.playlist_tracks.addItem(item)
+        finally:
+            self.playlist_tracks.blockSignals(False)
+            self.playlist_tracks.setUpdatesEnabled(True)
 
     def on_play_playlist(self):
         if not self.current_playlist_id:
@@ -1333,6 +1976,8 @@ class SpotifyPlayerWindow(QMainWindow):
 
     def apply_playback_state(self, playback: dict):
         if not playback or not playback.get("item"):
+            self._last_state_sig = None
+            self._local_progress_ms = 0.0
             self.track_label.setText("Nothing playing. Start playback in Spotify.")
             self.time_label.setText("--:-- / --:--")
             self.progress_slider.setValue(0)
@@ -1355,27 +2000,47 @@ class SpotifyPlayerWindow(QMainWindow):
         self._last_is_playing = is_playing
         track = playback["item"]
         track_id = track.get("id")
+
+        progress_ms = playback.get("progress_ms") or 0
+        duration_ms = track.get("duration_ms") or 0
+        device = playback.get("device") or {}
+        vol = device.get("volume_percent")
+
+        # Reconcile the local progress clock only when it has genuinely
+        # drifted (seek, network hiccup) or the track changed.
+        if (
+            track_id != self.last_track_id
+            or abs(self._local_progress_ms - progress_ms) > 1500
+        ):
+            self._local_progress_ms = float(progress_ms)
+
+        # Second-resolution signature of everything shown below: identical
+        # polls (common while paused, or between whole-second boundaries)
+        # skip every setText/setValue and the repaints they trigger.
+        sig = (track_id, is_playing, progress_ms // 1000, duration_ms, vol)
+        if sig == self._last_state_sig:
+            return
+        self._last_state_sig = sig
+
         name = track.get("name", "Unknown")
-        artists = ", ".join(a.get("name", "") for a in track.get("artists", []))
+        # Backend pre-joins artists into a string; keep the list fallback
+        # in case the payload came from a raw Spotify response.
+        artists = track.get("artists", "")
+        if not isinstance(artists, str):
+            artists = ", ".join(a.get("name", "") for a in artists or [])
         album_name = (track.get("album") or {}).get("name")
         self.track_label.setText(f"{name} — {artists}")
         self.current_track_uri = track.get("uri")
 
-        progress_ms = playback.get("progress_ms") or 0
-        duration_ms = track.get("duration_ms") or 0
         self.current_track_duration_ms = duration_ms
 
-        # crude genre hint from text (purely for theming)
-        text_blob = f"{name} {album_name or ''}".lower()
-        genre_hint = None
-        if any(word in text_blob for word in ["rock", "metal", "punk"]):
-            genre_hint = "rock"
-        elif any(word in text_blob for word in ["edm", "dance", "club", "remix"]):
-            genre_hint = "edm"
-        elif any(word in text_blob for word in ["chill", "lofi", "sleep", "study"]):
-            genre_hint = "chill"
-        elif any(word in text_blob for word in ["jazz", "swing", "bossa"]):
-            genre_hint = "jazz"
+        # crude genre hint from text (purely for theming); the hint can't
+        # change mid-track, so only rescan when the track does
+        if track_id != self.last_track_id:
+            text_blob = f"{name} {album_name or ''}".lower()
+            m = _GENRE_RE.search(text_blob)
+            self._genre_hint = _GENRE_MAP[m.group(1)] if m else None
+        genre_hint = self._genre_hint
 
         # update cassette widget
         self.cassette_widget.update_track(
@@ -1410,8 +2075,6 @@ class SpotifyPlayerWindow(QMainWindow):
             self.progress_slider.setValue(int(fraction * 1000))
 
         # Volume from device
-        device = playback.get("device") or {}
-        vol = device.get("volume_percent")
         if vol is not None and 0 <= vol <= 100:
             self.volume_slider.blockSignals(True)
             self.volume_slider.setValue(int(vol))
@@ -1419,12 +2082,7 @@ class SpotifyPlayerWindow(QMainWindow):
 
     @staticmethod
     def ms_to_mmss(ms: Optional[int]) -> str:
-        if ms is None or ms <= 0:
-            return "--:--"
-        seconds = int(ms / 1000)
-        m = seconds // 60
-        s = seconds % 60
-        return f"{m:02d}:{s:02d}"
+        return ms_to_mmss(ms)
 
 
 # ---------- main ----------
@@ -1433,6 +2091,9 @@ def main():
     backend_proc = start_backend()
 
     app = QApplication(sys.argv)
+    # Room for ~40 MB of decoded album covers before Qt starts evicting —
+    # a 640x640 ARGB32 cover is ~1.6 MB, so this holds a couple dozen.
+    QPixmapCache.setCacheLimit(40 * 1024)
     window = SpotifyPlayerWindow()
     window.show()
     exit_code = app.exec()
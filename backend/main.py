@@ -1,275 +1,413 @@
-from typing import Optional
-
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-
-from spotify_client import SpotifyClient
-
-app = FastAPI()
-sp_client = SpotifyClient()
-
-
-# ---------- Request models ----------
-
-class SeekRequest(BaseModel):
-    position_ms: int
-
-
-class VolumeRequest(BaseModel):
-    volume_percent: int
-
-
-class ShuffleRequest(BaseModel):
-    state: bool
-
-
-class RepeatRequest(BaseModel):
-    mode: str  # "off" | "track" | "context"
-
-
-class DeviceTransferRequest(BaseModel):
-    device_id: str
-
-
-class PlaylistPlayRequest(BaseModel):
-    playlist_id: str
-    device_id: Optional[str] = None
-
-
-class TrackModifyRequest(BaseModel):
-    track_uri: str
-
-
-# ---------- Playback state & basic controls ----------
-
-@app.get("/playback/state")
-def get_playback_state():
-    try:
-        playback = sp_client.get_playback_state()
-        return playback or {}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playback/play")
-def play():
-    try:
-        sp_client.play()
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playback/pause")
-def pause():
-    try:
-        sp_client.pause()
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playback/next")
-def next_track():
-    try:
-        sp_client.next()
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playback/previous")
-def previous_track():
-    try:
-        sp_client.previous()
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playback/seek")
-def seek(req: SeekRequest):
-    try:
-        sp_client.seek(req.position_ms)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ---------- Volume / shuffle / repeat ----------
-
-@app.post("/playback/volume")
-def set_volume(req: VolumeRequest):
-    try:
-        sp_client.set_volume(req.volume_percent)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playback/shuffle")
-def set_shuffle(req: ShuffleRequest):
-    try:
-        sp_client.set_shuffle(req.state)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playback/repeat")
-def set_repeat(req: RepeatRequest):
-    try:
-        sp_client.set_repeat(req.mode)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ---------- Devices ----------
-
-@app.get("/devices")
-def get_devices():
-    try:
-        raw = sp_client.get_devices()
-        devices = raw.get("devices", []) if raw else []
-        simple = []
-        for d in devices:
-            if not d:
-                continue
-            simple.append(
-                {
-                    "id": d.get("id"),
-                    "name": d.get("name"),
-                    "type": d.get("type"),
-                    "is_active": d.get("is_active"),
-                    "volume_percent": d.get("volume_percent"),
-                }
-            )
-        return {"devices": simple}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/devices/transfer")
-def transfer_playback(req: DeviceTransferRequest):
-    try:
-        sp_client.transfer_playback(req.device_id)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ---------- Playlists ----------
-
-@app.get("/playlists")
-def get_playlists():
-    try:
-        data = sp_client.get_playlists(limit=50)
-        items = data.get("items", []) if data else []
-        playlists = []
-        for pl in items:
-            if not pl:
-                continue
-            playlists.append(
-                {
-                    "id": pl.get("id"),
-                    "name": pl.get("name"),
-                    "tracks_total": (pl.get("tracks") or {}).get("total"),
-                    "external_url": (pl.get("external_urls") or {}).get("spotify"),
-                }
-            )
-        return {"playlists": playlists}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/playlists/{playlist_id}/tracks")
-def get_playlist_tracks(playlist_id: str):
-    try:
-        data = sp_client.get_playlist_tracks(playlist_id, limit=100)
-        items = data.get("items", []) if data else []
-        tracks = []
-        for it in items:
-            tr = it.get("track") if it else None
-            if not tr:
-                continue
-            artists = ", ".join(a.get("name", "") for a in (tr.get("artists") or []))
-            tracks.append(
-                {
-                    "id": tr.get("id"),
-                    "name": tr.get("name"),
-                    "artists": artists,
-                    "uri": tr.get("uri"),
-                }
-            )
-        return {"tracks": tracks}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playlists/play")
-def play_playlist(req: PlaylistPlayRequest):
-    try:
-        sp_client.play_playlist(req.playlist_id, req.device_id)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playlists/{playlist_id}/add_track")
-def add_track_to_playlist(playlist_id: str, req: TrackModifyRequest):
-    try:
-        sp_client.add_track_to_playlist(playlist_id, req.track_uri)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/playlists/{playlist_id}/remove_track")
-def remove_track_from_playlist(playlist_id: str, req: TrackModifyRequest):
-    try:
-        sp_client.remove_track_from_playlist(playlist_id, req.track_uri)
-        return {"status": "ok"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-# ---------- Queue ----------
-
-@app.get("/queue")
-def get_queue():
-    try:
-        data = sp_client.get_queue()
-        if not data:
-            return {"queue": []}
-
-        queue_items = data.get("queue", []) or []
-        tracks = []
-        for tr in queue_items:
-            if not tr:
-                continue
-            artists = ", ".join(a.get("name", "") for a in (tr.get("artists") or []))
-            tracks.append(
-                {
-                    "id": tr.get("id"),
-                    "name": tr.get("name"),
-                    "artists": artists,
-                    "uri": tr.get("uri"),
-                }
-            )
-        return {"queue": tracks}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/queue/clear")
-def clear_queue():
-    """
-    This will just return an error saying it's not supported,
-    because Spotify doesn't expose a clear-queue endpoint.
-    """
-    try:
-        sp_client.clear_queue()
-        return {"status": "ok"}
-    except Exception as e:
-        # 400 = client-side limitation, not server crash
-        raise HTTPException(status_code=400, detail=str(e))
+import asyncio
+import hashlib
+import json
+import sys
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+from spotify_client import ClientLimitationError, SpotifyClient
+
+app = FastAPI()
+# Compress the large list responses (/playlists, /playlists/{id}/tracks);
+# small control responses stay below the threshold and go out unchanged.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+sp_client = SpotifyClient()
+
+
+# ---------- Error handling ----------
+
+# One pair of handlers replaces the try/except boilerplate every route
+# used to carry: routes just call the client and return, and anything
+# that blows up still comes back as the same JSON the GUI expects.
+
+@app.exception_handler(ClientLimitationError)
+async def client_limitation_handler(request: Request, exc: ClientLimitationError):
+    # 400 = client-side limitation, not server crash
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request: Request, exc: Exception):
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
+
+# ---------- Request models ----------
+
+class SeekRequest(BaseModel):
+    position_ms: int
+
+
+class VolumeRequest(BaseModel):
+    volume_percent: int
+
+
+class ShuffleRequest(BaseModel):
+    state: bool
+
+
+class RepeatRequest(BaseModel):
+    mode: str  # "off" | "track" | "context"
+
+
+class DeviceTransferRequest(BaseModel):
+    device_id: str
+
+
+class PlaylistPlayRequest(BaseModel):
+    playlist_id: str
+    device_id: Optional[str] = None
+
+
+class TrackModifyRequest(BaseModel):
+    track_uri: str
+
+
+class TracksModifyRequest(BaseModel):
+    uris: List[str]
+
+
+class BatchCall(BaseModel):
+    id: str
+    method: str = "GET"
+    path: str
+
+
+class BatchRequest(BaseModel):
+    calls: List[BatchCall]
+
+
+# ---------- Response shaping ----------
+
+def _simple_track(tr: dict) -> dict:
+    """Shared track projection for /queue and /playlists/{id}/tracks."""
+    return {
+        "id": tr.get("id"),
+        "name": tr.get("name"),
+        "artists": ", ".join(a.get("name", "") for a in (tr.get("artists") or [])),
+        "uri": tr.get("uri"),
+    }
+
+
+def _etag_json(request: Request, payload) -> Response:
+    """
+    JSON response carrying an ETag (hash of the body) and honoring
+    If-None-Match: revalidating clients (api_client._cached_get) get a
+    bodyless 304 for unchanged list payloads instead of re-downloading
+    and re-parsing them.
+    """
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=body, media_type="application/json", headers={"ETag": etag}
+    )
+
+
+# ---------- Playback state & basic controls ----------
+
+# Read routes are async and push the sync spotipy call onto the
+# threadpool explicitly: the event loop stays free to serve other
+# clients (and the SSE stream) while Spotify round-trips are in flight,
+# and /batch can run them concurrently.
+
+def _shape_state(playback) -> dict:
+    if playback:
+        # Flatten artists to the display string once here, like the
+        # /queue and /playlists/{id}/tracks routes already do, so the
+        # GUI doesn't re-join the list on every poll.
+        item = playback.get("item")
+        if item and isinstance(item.get("artists"), list):
+            item["artists"] = ", ".join(
+                a.get("name", "") for a in item["artists"] if a
+            )
+    return playback or {}
+
+
+@app.get("/playback/state")
+async def get_playback_state():
+    return _shape_state(await run_in_threadpool(sp_client.get_playback_state))
+
+
+@app.get("/playback/stream")
+async def stream_playback_state():
+    """
+    Server-sent events: pushes the playback state whenever it changes so
+    clients can hold one long-lived connection instead of polling
+    /playback/state on a timer.
+    """
+
+    async def event_stream():
+        last = None
+        while True:
+            try:
+                playback = await run_in_threadpool(sp_client.get_playback_state)
+            except Exception:
+                playback = None
+            payload = json.dumps(playback or {})
+            if payload != last:
+                last = payload
+                yield f"data: {payload}\n\n"
+            await asyncio.sleep(1.0)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/playback/play")
+def play():
+    sp_client.play()
+    return {"status": "ok"}
+
+
+@app.post("/playback/pause")
+def pause():
+    sp_client.pause()
+    return {"status": "ok"}
+
+
+@app.post("/playback/next")
+def next_track():
+    sp_client.next()
+    return {"status": "ok"}
+
+
+@app.post("/playback/previous")
+def previous_track():
+    sp_client.previous()
+    return {"status": "ok"}
+
+
+@app.post("/playback/seek")
+def seek(req: SeekRequest):
+    sp_client.seek(req.position_ms)
+    return {"status": "ok"}
+
+
+# ---------- Volume / shuffle / repeat ----------
+
+@app.post("/playback/volume")
+def set_volume(req: VolumeRequest):
+    sp_client.set_volume(req.volume_percent)
+    return {"status": "ok"}
+
+
+@app.post("/playback/shuffle")
+def set_shuffle(req: ShuffleRequest):
+    sp_client.set_shuffle(req.state)
+    return {"status": "ok"}
+
+
+@app.post("/playback/repeat")
+def set_repeat(req: RepeatRequest):
+    sp_client.set_repeat(req.mode)
+    return {"status": "ok"}
+
+
+# ---------- Devices ----------
+
+def _shape_devices(raw) -> dict:
+    devices = raw.get("devices", []) if raw else []
+    return {
+        "devices": [
+            {
+                "id": d.get("id"),
+                "name": d.get("name"),
+                "type": d.get("type"),
+                "is_active": d.get("is_active"),
+                "volume_percent": d.get("volume_percent"),
+            }
+            for d in devices
+            if d
+        ]
+    }
+
+
+@app.get("/devices")
+async def get_devices():
+    return _shape_devices(await run_in_threadpool(sp_client.get_devices))
+
+
+@app.post("/devices/transfer")
+def transfer_playback(req: DeviceTransferRequest):
+    sp_client.transfer_playback(req.device_id)
+    return {"status": "ok"}
+
+
+# ---------- Playlists ----------
+
+async def _playlists_payload():
+    data = await run_in_threadpool(sp_client.get_playlists, limit=50)
+    items = data.get("items", []) if data else []
+    return {
+        "playlists": [
+            {
+                "id": pl.get("id"),
+                "name": pl.get("name"),
+                "tracks_total": (pl.get("tracks") or {}).get("total"),
+                "external_url": (pl.get("external_urls") or {}).get("spotify"),
+            }
+            for pl in items
+            if pl
+        ]
+    }
+
+
+@app.get("/playlists")
+async def get_playlists(request: Request):
+    return _etag_json(request, await _playlists_payload())
+
+
+async def _playlist_tracks_payload(playlist_id: str, all_pages: bool = True):
+    if all_pages:
+        # Complete track list; pages past the first are fetched
+        # concurrently by the client, so big playlists aren't truncated
+        # at 100 and still cost ~1 round-trip of latency.
+        items = await run_in_threadpool(
+            sp_client.get_all_playlist_tracks, playlist_id
+        )
+    else:
+        data = await run_in_threadpool(
+            sp_client.get_playlist_tracks, playlist_id, limit=100
+        )
+        items = data.get("items", []) if data else []
+    return {
+        "tracks": [
+            _simple_track(tr)
+            for tr in (it.get("track") for it in items if it)
+            if tr
+        ]
+    }
+
+
+@app.get("/playlists/{playlist_id}/tracks")
+async def get_playlist_tracks(request: Request, playlist_id: str, all: bool = True):
+    return _etag_json(
+        request, await _playlist_tracks_payload(playlist_id, all_pages=all)
+    )
+
+
+@app.post("/playlists/play")
+def play_playlist(req: PlaylistPlayRequest):
+    sp_client.play_playlist(req.playlist_id, req.device_id)
+    return {"status": "ok"}
+
+
+@app.post("/playlists/{playlist_id}/add_track")
+def add_track_to_playlist(playlist_id: str, req: TrackModifyRequest):
+    sp_client.add_track_to_playlist(playlist_id, req.track_uri)
+    return {"status": "ok"}
+
+
+@app.post("/playlists/{playlist_id}/remove_track")
+def remove_track_from_playlist(playlist_id: str, req: TrackModifyRequest):
+    sp_client.remove_track_from_playlist(playlist_id, req.track_uri)
+    return {"status": "ok"}
+
+
+@app.post("/playlists/{playlist_id}/add_tracks")
+def add_tracks_to_playlist(playlist_id: str, req: TracksModifyRequest):
+    sp_client.add_tracks_to_playlist(playlist_id, req.uris)
+    return {"status": "ok"}
+
+
+@app.post("/playlists/{playlist_id}/remove_tracks")
+def remove_tracks_from_playlist(playlist_id: str, req: TracksModifyRequest):
+    sp_client.remove_tracks_from_playlist(playlist_id, req.uris)
+    return {"status": "ok"}
+
+# ---------- Queue ----------
+
+@app.get("/queue")
+async def get_queue():
+    data = await run_in_threadpool(sp_client.get_queue)
+    if not data:
+        return {"queue": []}
+
+    queue_items = data.get("queue", []) or []
+    return {"queue": [_simple_track(tr) for tr in queue_items if tr]}
+
+
+@app.post("/queue/clear")
+def clear_queue():
+    """
+    This will just return an error saying it's not supported,
+    because Spotify doesn't expose a clear-queue endpoint.
+    """
+    # raises ClientLimitationError -> 400 via its handler
+    sp_client.clear_queue()
+    return {"status": "ok"}
+
+
+# ---------- Bootstrap ----------
+
+@app.get("/bootstrap")
+async def bootstrap():
+    """
+    Everything the GUI needs at startup in one response — playback state
+    included, so the first paint doesn't need a separate poll. Devices
+    and playback come from the client's combined get_initial_state; all
+    the Spotify calls overlap instead of serializing.
+    """
+    initial, playlists, queue = await asyncio.gather(
+        run_in_threadpool(sp_client.get_initial_state),
+        _playlists_payload(),
+        get_queue(),
+    )
+    return {
+        "state": _shape_state(initial["playback"]),
+        "devices": _shape_devices(initial["devices"]).get("devices", []),
+        "playlists": playlists.get("playlists", []),
+        "queue": queue.get("queue", []),
+    }
+
+
+# ---------- Batch ----------
+
+# Read-only endpoints the GUI refreshes together; one POST to /batch
+# replaces one round-trip per endpoint.
+_BATCH_ROUTES = {
+    ("GET", "/playback/state"): get_playback_state,
+    ("GET", "/devices"): get_devices,
+    ("GET", "/playlists"): _playlists_payload,
+    ("GET", "/queue"): get_queue,
+}
+
+
+@app.post("/batch")
+async def batch(req: BatchRequest):
+    # Resolve every handler up front, then run them concurrently — the
+    # point of batching is one round-trip, not four serialized ones.
+    handlers = []
+    for call in req.calls:
+        handler = _BATCH_ROUTES.get((call.method.upper(), call.path))
+        if handler is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported batch call: {call.method} {call.path}",
+            )
+        handlers.append((call.id, handler))
+    results = await asyncio.gather(*(handler() for _, handler in handlers))
+    return {call_id: result for (call_id, _), result in zip(handlers, results)}
+
+
+# ---------- Direct run ----------
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Same tuning start_backend passes on the command line: C event loop
+    # and HTTP parser where available (uvloop has no Windows build).
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        workers=1,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level="warning",
+    )
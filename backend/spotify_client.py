@@ -1,120 +1,451 @@
-import os
-from pathlib import Path
-from typing import Optional
-
-from dotenv import load_dotenv
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
-
-BASE_DIR = Path(__file__).resolve().parent
-load_dotenv(BASE_DIR / ".env")
-
-CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
-CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
-REDIRECT_URI = os.getenv("SPOTIFY_REDIRECT_URI")
-
-SCOPES = (
-    "user-read-playback-state "
-    "user-modify-playback-state "
-    "user-read-currently-playing "
-    "playlist-read-private "
-    "playlist-modify-private "
-    "playlist-modify-public "
-)
-
-if not (CLIENT_ID and CLIENT_SECRET and REDIRECT_URI):
-    raise RuntimeError("Missing Spotify credentials in .env")
-
-
-class SpotifyClient:
-    def __init__(self):
-        auth_manager = SpotifyOAuth(
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET,
-            redirect_uri=REDIRECT_URI,
-            scope=SCOPES,
-            cache_path=str(BASE_DIR / ".spotify_token_cache"),  # reuse login
-            show_dialog=False,
-        )
-        self.sp = spotipy.Spotify(auth_manager=auth_manager)
-
-    # ---------- Playback state & basic controls ----------
-
-    def get_playback_state(self):
-        return self.sp.current_playback()
-
-    def play(self):
-        self.sp.start_playback()
-
-    def pause(self):
-        self.sp.pause_playback()
-
-    def next(self):
-        self.sp.next_track()
-
-    def previous(self):
-        self.sp.previous_track()
-
-    def seek(self, position_ms: int):
-        self.sp.seek_track(position_ms)
-
-    # ---------- Volume / shuffle / repeat ----------
-
-    def set_volume(self, volume_percent: int):
-        volume_percent = max(0, min(100, int(volume_percent)))
-        self.sp.volume(volume_percent)
-
-    def set_shuffle(self, state: bool):
-        self.sp.shuffle(state)
-
-    def set_repeat(self, mode: str):
-        # mode must be "off", "track", or "context"
-        if mode not in ("off", "track", "context"):
-            mode = "off"
-        self.sp.repeat(mode)
-
-    # ---------- Devices ----------
-
-    def get_devices(self):
-        return self.sp.devices()
-
-    def transfer_playback(self, device_id: str):
-        # force_play=False so it just switches device
-        self.sp.transfer_playback(device_id=device_id, force_play=False)
-
-    # ---------- Playlists ----------
-
-    def get_playlists(self, limit: int = 50, offset: int = 0):
-        return self.sp.current_user_playlists(limit=limit, offset=offset)
-
-    def get_playlist_tracks(self, playlist_id: str, limit: int = 100, offset: int = 0):
-        return self.sp.playlist_items(playlist_id, limit=limit, offset=offset)
-
-    def play_playlist(self, playlist_id: str, device_id: Optional[str] = None):
-        playlist_uri = f"spotify:playlist:{playlist_id}"
-        if device_id:
-            self.sp.start_playback(device_id=device_id, context_uri=playlist_uri)
-        else:
-            self.sp.start_playback(context_uri=playlist_uri)
-
-    def add_track_to_playlist(self, playlist_id: str, track_uri: str):
-        # track_uri like "spotify:track:xxxx"
-        self.sp.playlist_add_items(playlist_id, [track_uri])
-
-    def remove_track_from_playlist(self, playlist_id: str, track_uri: str):
-        self.sp.playlist_remove_all_occurrences_of_items(playlist_id, [track_uri])
-
-    # ---------- Queue ----------
-
-    def get_queue(self):
-        """
-        Returns Spotify queue (currently_playing + queue list).
-        """
-        return self.sp.queue()
-
-    def clear_queue(self):
-        """
-        Spotify Web API does NOT support clearing the entire queue.
-        We raise an error so the frontend can show a message.
-        """
-        raise RuntimeError("Clearing the queue is not supported by the Spotify API.")
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import spotipy
+from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
+from spotipy.exceptions import SpotifyException
+from spotipy.oauth2 import SpotifyOAuth
+
+BASE_DIR = Path(__file__).resolve().parent
+# Skip the .env stat/parse when the shell already provides credentials
+# (production/CI); the file is only the local-development fallback.
+if not os.getenv("SPOTIFY_CLIENT_ID"):
+    load_dotenv(BASE_DIR / ".env")
+
+CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
+CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
+REDIRECT_URI = os.getenv("SPOTIFY_REDIRECT_URI")
+
+SCOPES = (
+    "user-read-playback-state "
+    "user-modify-playback-state "
+    "user-read-currently-playing "
+    "playlist-read-private "
+    "playlist-modify-private "
+    "playlist-modify-public "
+)
+
+# Minimal playlist_items projection: everything the API layer forwards,
+# nothing else. The full payload is ~4-8 KB per track, dominated by the
+# available_markets country lists; this trims it to a few hundred bytes.
+DEFAULT_TRACK_FIELDS = "items(track(id,uri,name,artists(name),duration_ms)),total,next"
+
+
+class ClientLimitationError(RuntimeError):
+    """The Spotify Web API simply doesn't support the requested operation."""
+
+
+class _WriteThroughCacheHandler(MemoryCacheHandler):
+    """
+    Token cache that answers from memory — spotipy validates the token
+    before every request, and the default CacheFileHandler re-reads and
+    re-parses the JSON file each time — while still writing refreshed
+    tokens through to disk so logins survive restarts.
+    """
+
+    def __init__(self, file_handler: CacheFileHandler):
+        super().__init__(token_info=file_handler.get_cached_token())
+        self._file_handler = file_handler
+
+    def save_token_to_cache(self, token_info):
+        super().save_token_to_cache(token_info)
+        self._file_handler.save_token_to_cache(token_info)
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests/second with bursts up to
+    `capacity`. A caller over budget sleeps until a token accrues, so a
+    burst of UI events (or the parallel paginator) smooths out below
+    Spotify's rate limits instead of tripping a 429 storm.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = float(rate)
+        self._capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._last) * self._rate
+                )
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """
+    Bind an orjson-backed json() onto each response. spotipy decodes
+    every payload through Response.json, and orjson's C parser is 3-5x
+    faster than stdlib json on the big playlist pages. A hook is used
+    rather than swapping requests.models.complexjson — requests also
+    calls complexjson.dumps(..., allow_nan=False), which orjson's dumps
+    doesn't accept.
+    """
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
+
+class SpotifyClient:
+    def __init__(self):
+        # Validated here rather than at import so the module stays
+        # importable (tests, tooling) without a full credentials setup.
+        if not (CLIENT_ID and CLIENT_SECRET and REDIRECT_URI):
+            raise RuntimeError("Missing Spotify credentials in .env")
+        auth_manager = SpotifyOAuth(
+            client_id=CLIENT_ID,
+            client_secret=CLIENT_SECRET,
+            redirect_uri=REDIRECT_URI,
+            scope=SCOPES,
+            cache_handler=_WriteThroughCacheHandler(
+                CacheFileHandler(cache_path=str(BASE_DIR / ".spotify_token_cache"))
+            ),  # reuse login
+            show_dialog=False,
+        )
+        # spotipy's default session pools only 10 connections; the worker
+        # pool can exceed that and silently discard keep-alive sockets,
+        # paying a fresh TLS handshake per call. Inject a session sized
+        # for our concurrency, with transport-level retries that honor
+        # Retry-After.
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=1,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    respect_retry_after_header=True,
+                ),
+            ),
+        )
+        session.hooks["response"].append(_orjson_response_hook)
+        self._session = session
+        self.sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=session)
+        # ~10 req/s with a burst of 10 keeps us safely under Spotify's
+        # per-app and per-user ceilings.
+        self._bucket = _TokenBucket(rate=10, capacity=10)
+        # Worker pool for fetching independent pages/endpoints in
+        # parallel; spotipy is synchronous, so threads are how we overlap
+        # its round-trips.
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="spotify")
+        # Short-lived playback cache: back-to-back polls inside the TTL
+        # reuse the last payload instead of re-asking Spotify.
+        self._playback_cache = None
+        self._playback_ts = 0.0
+        # Playlist pages keyed by (limit, offset): body + ETag + fetch
+        # time, so repeat visits to the playlists view cost a 304 (or
+        # nothing inside the TTL) instead of a full payload.
+        self._playlist_cache = {}
+        # Bound-method aliases for the constantly-polled playback calls;
+        # skips the self.sp.<attr> lookup chain on every tick.
+        self._current_playback = self.sp.current_playback
+        self._start_playback = self.sp.start_playback
+        self._pause_playback = self.sp.pause_playback
+        self._next_track = self.sp.next_track
+        self._previous_track = self.sp.previous_track
+        self._seek_track = self.sp.seek_track
+        # Refresh the access token ahead of expiry in the background so
+        # no user-facing call pays the ~500ms refresh round-trip.
+        self._refresh_lock = threading.Lock()
+        self._schedule_token_refresh()
+
+    # ---------- Token refresh ----------
+
+    def _schedule_token_refresh(self):
+        token = self.sp.auth_manager.cache_handler.get_cached_token()
+        if token and token.get("expires_at"):
+            delay = max(30.0, token["expires_at"] - time.time() - 60.0)
+        else:
+            delay = 60.0  # no token yet (first login pending); check again soon
+        timer = threading.Timer(delay, self._refresh_token)
+        timer.daemon = True
+        timer.start()
+        self._refresh_timer = timer
+
+    def _refresh_token(self):
+        try:
+            # The lock keeps this from racing spotipy's own lazy refresh.
+            with self._refresh_lock:
+                token = self.sp.auth_manager.cache_handler.get_cached_token()
+                if token and token.get("refresh_token"):
+                    self.sp.auth_manager.refresh_access_token(token["refresh_token"])
+        except Exception:
+            pass  # lazy refresh on the next API call still covers us
+        finally:
+            self._schedule_token_refresh()
+
+    _MAX_RETRIES = 5
+
+    def _call_with_retry(self, fn, *args, **kwargs):
+        """
+        spotipy raises SpotifyException on 429 without honoring the
+        Retry-After header Spotify sends alongside it. Sleep the
+        server-dictated minimum (falling back to capped exponential
+        backoff) and retry, so a transient burst costs a brief pause
+        instead of a hard failure.
+
+        Every attempt first takes a token from the bucket — all spotipy
+        traffic funnels through here, so controls, list fetches and the
+        paginator share one throttle.
+        """
+        for attempt in range(self._MAX_RETRIES):
+            self._bucket.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except SpotifyException as exc:
+                if exc.http_status != 429 or attempt == self._MAX_RETRIES - 1:
+                    raise
+                try:
+                    retry_after = float((exc.headers or {}).get("Retry-After", 0))
+                except (TypeError, ValueError):
+                    retry_after = 0.0
+                time.sleep(min(32.0, max(retry_after, float(2 ** attempt))))
+
+    # ---------- Playback state & basic controls ----------
+
+    _PLAYBACK_TTL = 0.5  # seconds
+
+    def get_playback_state(self):
+        # Serve polls inside the TTL from cache, advancing progress_ms by
+        # the elapsed wall time so the progress bar doesn't stutter; the
+        # bucket token is only spent on real fetches.
+        now = time.monotonic()
+        cached = self._playback_cache
+        if cached is not None and now - self._playback_ts < self._PLAYBACK_TTL:
+            state = dict(cached)
+            if state.get("is_playing") and state.get("progress_ms") is not None:
+                state["progress_ms"] += int((now - self._playback_ts) * 1000)
+            return state
+
+        playback = self._call_with_retry(self._current_playback)
+        self._playback_cache = playback
+        self._playback_ts = time.monotonic()
+        return playback
+
+    def _invalidate_playback_cache(self):
+        # Controls change what current_playback would return; force the
+        # next poll to fetch fresh state.
+        self._playback_ts = 0.0
+
+    def play(self):
+        self._call_with_retry(self._start_playback)
+        self._invalidate_playback_cache()
+
+    def pause(self):
+        self._call_with_retry(self._pause_playback)
+        self._invalidate_playback_cache()
+
+    def next(self):
+        self._call_with_retry(self._next_track)
+        self._invalidate_playback_cache()
+
+    def previous(self):
+        self._call_with_retry(self._previous_track)
+        self._invalidate_playback_cache()
+
+    def seek(self, position_ms: int):
+        self._call_with_retry(self._seek_track, position_ms)
+        self._invalidate_playback_cache()
+
+    # ---------- Volume / shuffle / repeat ----------
+
+    def set_volume(self, volume_percent: int):
+        volume_percent = max(0, min(100, int(volume_percent)))
+        self._call_with_retry(self.sp.volume, volume_percent)
+        self._invalidate_playback_cache()
+
+    def set_shuffle(self, state: bool):
+        self._call_with_retry(self.sp.shuffle, state)
+        self._invalidate_playback_cache()
+
+    def set_repeat(self, mode: str):
+        # mode must be "off", "track", or "context"
+        if mode not in ("off", "track", "context"):
+            mode = "off"
+        self._call_with_retry(self.sp.repeat, mode)
+        self._invalidate_playback_cache()
+
+    # ---------- Devices ----------
+
+    def get_devices(self):
+        return self._call_with_retry(self.sp.devices)
+
+    def transfer_playback(self, device_id: str):
+        # force_play=False so it just switches device
+        self._call_with_retry(
+            self.sp.transfer_playback, device_id=device_id, force_play=False
+        )
+        self._invalidate_playback_cache()
+
+    def get_initial_state(self):
+        """
+        Devices + playback state in one call. The two endpoints are
+        independent, so they overlap on the worker pool and a cold start
+        costs ~1 round-trip instead of 2.
+        """
+        f_devices = self._pool.submit(self.get_devices)
+        f_playback = self._pool.submit(self.get_playback_state)
+        return {"devices": f_devices.result(), "playback": f_playback.result()}
+
+    # ---------- Playlists ----------
+
+    _PLAYLISTS_TTL = 60.0  # seconds
+
+    def get_playlists(self, limit: int = 50, offset: int = 0):
+        """
+        User playlists change rarely but get re-fetched on every return
+        to the playlists view. Inside the TTL the cached page is returned
+        as-is; after that a conditional GET with If-None-Match turns an
+        unchanged page into a ~40-byte 304 instead of a full payload +
+        parse. Goes through our session directly since spotipy doesn't
+        expose conditional requests.
+        """
+        key = (limit, offset)
+        entry = self._playlist_cache.get(key)
+        now = time.monotonic()
+        if entry and now - entry["ts"] < self._PLAYLISTS_TTL:
+            return entry["body"]
+
+        headers = {
+            "Authorization": "Bearer "
+            + self.sp.auth_manager.get_access_token(as_dict=False)
+        }
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        self._bucket.acquire()
+        resp = self._session.get(
+            "https://api.spotify.com/v1/me/playlists",
+            params={"limit": limit, "offset": offset},
+            headers=headers,
+            timeout=10,
+        )
+        if resp.status_code == 304 and entry:
+            entry["ts"] = now
+            return entry["body"]
+        resp.raise_for_status()
+        body = resp.json()
+        self._playlist_cache[key] = {
+            "etag": resp.headers.get("ETag"),
+            "body": body,
+            "ts": now,
+        }
+        return body
+
+    def get_playlist_tracks(
+        self,
+        playlist_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        fields: Optional[str] = DEFAULT_TRACK_FIELDS,
+    ):
+        # fields=None fetches the full payload for callers that need it
+        return self._call_with_retry(
+            self.sp.playlist_items, playlist_id, limit=limit, offset=offset,
+            fields=fields,
+        )
+
+    def get_all_playlist_tracks(self, playlist_id: str):
+        """
+        Fetch every track of a playlist. The first page tells us `total`;
+        the remaining offset pages are independent, so they go out on the
+        worker pool concurrently instead of one serialized round-trip per
+        100 tracks.
+        """
+        first = self._call_with_retry(
+            self.sp.playlist_items, playlist_id, limit=100, offset=0,
+            fields=DEFAULT_TRACK_FIELDS,
+        )
+        if not first:
+            return []
+        items = list(first.get("items", []))
+        total = first.get("total", len(items))
+        if total > 100:
+            def fetch_page(off):
+                return self._call_with_retry(
+                    self.sp.playlist_items, playlist_id, limit=100, offset=off,
+                    fields=DEFAULT_TRACK_FIELDS,
+                )
+
+            pages = self._pool.map(fetch_page, range(100, total, 100))
+            for page in pages:
+                if page:
+                    items.extend(page.get("items", []))
+        return items
+
+    def play_playlist(self, playlist_id: str, device_id: Optional[str] = None):
+        playlist_uri = f"spotify:playlist:{playlist_id}"
+        if device_id:
+            self._call_with_retry(
+                self._start_playback, device_id=device_id, context_uri=playlist_uri
+            )
+        else:
+            self._call_with_retry(self._start_playback, context_uri=playlist_uri)
+        self._invalidate_playback_cache()
+
+    _PLAYLIST_CHUNK = 100  # Spotify's cap per add/remove request
+
+    def add_tracks_to_playlist(self, playlist_id: str, track_uris):
+        # track_uris like ["spotify:track:xxxx", ...]. Dedupe first
+        # (dict.fromkeys keeps order), then send one request per chunk of
+        # 100 instead of one per track.
+        uris = list(dict.fromkeys(track_uris))
+        for i in range(0, len(uris), self._PLAYLIST_CHUNK):
+            self._call_with_retry(
+                self.sp.playlist_add_items,
+                playlist_id,
+                uris[i:i + self._PLAYLIST_CHUNK],
+            )
+
+    def remove_tracks_from_playlist(self, playlist_id: str, track_uris):
+        uris = list(dict.fromkeys(track_uris))
+        for i in range(0, len(uris), self._PLAYLIST_CHUNK):
+            self._call_with_retry(
+                self.sp.playlist_remove_all_occurrences_of_items,
+                playlist_id,
+                uris[i:i + self._PLAYLIST_CHUNK],
+            )
+
+    def add_track_to_playlist(self, playlist_id: str, track_uri: str):
+        self.add_tracks_to_playlist(playlist_id, [track_uri])
+
+    def remove_track_from_playlist(self, playlist_id: str, track_uri: str):
+        self.remove_tracks_from_playlist(playlist_id, [track_uri])
+
+    # ---------- Queue ----------
+
+    def get_queue(self):
+        """
+        Returns Spotify queue (currently_playing + queue list).
+        """
+        return self._call_with_retry(self.sp.queue)
+
+    def clear_queue(self):
+        """
+        Spotify Web API does NOT support clearing the entire queue.
+        We raise an error so the frontend can show a message.
+        """
+        raise ClientLimitationError(
+            "Clearing the queue is not supported by the Spotify API."
+        )